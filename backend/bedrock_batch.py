@@ -0,0 +1,96 @@
+"""
+Bedrock batch inference helper.
+
+Submits many model inputs as a single model invocation job: the inputs are
+written as one JSONL object to S3, the job is polled until it finishes, and
+the output records are read back keyed by record ID. Bedrock runs the records
+in parallel on its side at batch pricing, with no per-request round-trips.
+"""
+
+import logging
+import time
+from typing import Any, Dict
+
+import boto3
+import orjson
+
+from config import get_config
+
+# Get configuration singleton
+config = get_config()
+
+logger = logging.getLogger(__name__)
+
+# Job states after which the job will make no more progress
+TERMINAL_STATUSES = {"Completed", "PartiallyCompleted", "Failed", "Stopped", "Expired"}
+
+
+def run_job(
+    model_inputs: Dict[str, Dict[str, Any]],
+    bucket: str,
+    role_arn: str,
+    prefix: str = "eval-batch",
+    poll_seconds: int = 60,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Run one batch inference job and return its output records.
+
+    Args:
+        model_inputs: Request bodies keyed by record ID
+        bucket: S3 bucket for the job input and output
+        role_arn: Service role Bedrock assumes to read and write the bucket
+        prefix: Key prefix for job files within the bucket
+        poll_seconds: Delay between job status checks
+
+    Returns:
+        Output records keyed by record ID; each has either a 'modelOutput'
+        or an 'error' entry. Inputs Bedrock produced no record for are absent.
+
+    Raises:
+        RuntimeError: If the job does not complete
+    """
+    job_name = f"requirements-eval-{time.strftime('%Y%m%d-%H%M%S', time.gmtime())}"
+    input_key = f"{prefix}/{job_name}/input.jsonl"
+    output_prefix = f"{prefix}/{job_name}/output"
+
+    records = b"".join(
+        orjson.dumps(
+            {"recordId": record_id, "modelInput": model_input}, option=orjson.OPT_APPEND_NEWLINE
+        )
+        for record_id, model_input in model_inputs.items()
+    )
+
+    s3_client = boto3.client("s3", region_name=config.bedrock_region)
+    s3_client.put_object(Bucket=bucket, Key=input_key, Body=records)
+
+    bedrock = boto3.client("bedrock", region_name=config.bedrock_region)
+    job_arn = bedrock.create_model_invocation_job(
+        jobName=job_name,
+        roleArn=role_arn,
+        modelId=config.bedrock_model_id,
+        inputDataConfig={
+            "s3InputDataConfig": {"s3Uri": f"s3://{bucket}/{input_key}", "s3InputFormat": "JSONL"}
+        },
+        outputDataConfig={"s3OutputDataConfig": {"s3Uri": f"s3://{bucket}/{output_prefix}/"}},
+    )["jobArn"]
+    logger.info("Submitted batch job: %s", job_arn)
+
+    while True:
+        status = bedrock.get_model_invocation_job(jobIdentifier=job_arn)["status"]
+        if status in TERMINAL_STATUSES:
+            break
+        logger.info("Batch job status: %s", status)
+        time.sleep(poll_seconds)
+
+    if status not in ("Completed", "PartiallyCompleted"):
+        raise RuntimeError(f"Batch job {job_arn} finished with status {status}")
+
+    # Bedrock writes <input file name>.out under a folder named after the job ID
+    job_id = job_arn.rsplit("/", 1)[-1]
+    output = s3_client.get_object(Bucket=bucket, Key=f"{output_prefix}/{job_id}/input.jsonl.out")
+    outputs = {}
+    for line in output["Body"].iter_lines():
+        if line:
+            record = orjson.loads(line)
+            outputs[record.get("recordId")] = record
+    return outputs
@@ -5,15 +5,18 @@ This module provides a single source of truth for all configuration values,
 including the Bedrock model selection. The application is designed to be
 model-agnostic and can work with different Bedrock models.
 
-Uses Pydantic for configuration validation with fail-fast behavior.
+Configuration is a frozen dataclass read from the environment and an optional
+.env file with fail-fast validation; Pydantic validates the model's evaluation
+responses.
 """
 
 import os
 import sys
-from typing import List, Optional, Tuple
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Union
 
-from pydantic import BaseModel, Field, field_validator, ValidationError
-from pydantic_settings import BaseSettings
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
 
 
 class ConfigurationError(Exception):
@@ -22,12 +25,62 @@ class ConfigurationError(Exception):
     pass
 
 
-class Config(BaseSettings):
+# Inclusive (min, max) bounds for numeric settings; None leaves a side open
+_CONFIG_BOUNDS: Dict[str, Tuple[Optional[float], Optional[float]]] = {
+    "bedrock_timeout": (5, 120),
+    "daily_rate_limit": (1, 10000),
+    "dynamodb_max_pool_connections": (1, 1000),
+    "model_temperature": (0.0, 1.0),
+    "model_max_tokens": (256, 4096),
+    "min_requirement_length": (1, None),
+    "max_requirement_length": (100, None),
+    "completeness_score_min": (1, None),
+    "completeness_score_max": (None, 10),
+}
+
+_VALID_LOG_LEVELS = {"DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"}
+
+_VALID_LATENCY_MODES = {"standard", "optimized"}
+
+# Optional dotenv file read by Config.from_env, relative to the working directory
+ENV_FILE = ".env"
+
+
+def _read_env_file(path: str) -> Dict[str, str]:
+    """
+    Read KEY=VALUE lines from a dotenv file, keyed by upper-case name.
+
+    Blank lines and # comments are skipped, an "export " prefix is allowed, and
+    matching quotes around a value are removed. A missing file reads as empty.
+    """
+    values: Dict[str, str] = {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    except FileNotFoundError:
+        return values
+    for line in lines:
+        line = line.strip()
+        if line.startswith("export "):
+            line = line[len("export ") :].lstrip()
+        key, sep, value = line.partition("=")
+        if not sep or line.startswith("#"):
+            continue
+        value = value.strip()
+        if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+            value = value[1:-1]
+        values[key.strip().upper()] = value
+    return values
+
+
+@dataclass(frozen=True, slots=True)
+class Config:
     """
     Centralized configuration for the Requirements Evaluator.
 
-    All configuration values are validated using Pydantic. Invalid configuration
-    will cause the application to fail fast at startup with clear error messages.
+    Values are read from environment variables and an optional .env file by
+    from_env() and checked in __post_init__. Invalid configuration will cause the application
+    to fail fast at startup with clear error messages.
 
     All configuration values should be accessed through the singleton instance
     to ensure consistency across the application.
@@ -42,78 +95,111 @@ class Config(BaseSettings):
     # - anthropic.claude-3-sonnet-20240229-v1:0
     # - anthropic.claude-3-opus-20240229-v1:0
     # - Other OpenAI and foundation models available in Bedrock
-    bedrock_model_id: str = Field(
-        default="openai.gpt-oss-120b-1:0", description="Amazon Bedrock model ID for evaluations"
-    )
+    bedrock_model_id: str = "openai.gpt-oss-120b-1:0"
 
-    bedrock_region: str = Field(default="us-east-1", description="AWS region for Bedrock API calls")
+    # AWS region for Bedrock API calls
+    bedrock_region: str = "us-east-1"
 
-    bedrock_timeout: int = Field(
-        default=30, ge=5, le=120, description="Bedrock API call timeout in seconds"
-    )
+    # Bedrock API call timeout in seconds
+    bedrock_timeout: int = 30
+
+    # Bedrock inference latency mode ("standard" or "optimized"); latency-optimized
+    # inference is only available for some models and regions
+    bedrock_latency_mode: str = "standard"
 
     # Rate Limiting Configuration
-    rate_limit_table: str = Field(default="", description="DynamoDB table name for rate limiting")
+    # DynamoDB table name for rate limiting
+    rate_limit_table: str = ""
 
-    daily_rate_limit: int = Field(
-        default=50, ge=1, le=10000, description="Maximum requests per IP per day"
-    )
+    # Maximum requests per IP per day
+    daily_rate_limit: int = 50
+
+    # Size of the DynamoDB client's HTTPS connection pool; raise it only when
+    # one process serves many requests concurrently
+    dynamodb_max_pool_connections: int = 10
+
+    # DynamoDB endpoint override, e.g. a VPC interface endpoint; empty uses the
+    # regional public endpoint
+    dynamodb_endpoint_url: str = ""
 
     # Logging Configuration
-    log_level: str = Field(
-        default="INFO", description="Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)"
-    )
+    # Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
+    log_level: str = "INFO"
 
     # Model Parameters
-    model_temperature: float = Field(
-        default=0.2, ge=0.0, le=1.0, description="Model temperature for consistent evaluations"
-    )
+    # Model temperature for consistent evaluations
+    model_temperature: float = 0.2
 
-    model_max_tokens: int = Field(
-        default=1024, ge=256, le=4096, description="Maximum tokens in model response"
-    )
+    # Maximum tokens in model response
+    model_max_tokens: int = 1024
 
     # Input Validation
-    min_requirement_length: int = Field(
-        default=10, ge=1, description="Minimum requirement text length"
-    )
-
-    max_requirement_length: int = Field(
-        default=5000, ge=100, description="Maximum requirement text length"
-    )
+    min_requirement_length: int = 10
+    max_requirement_length: int = 5000
 
     # Completeness Score Validation
-    completeness_score_min: int = Field(
-        default=1, ge=1, description="Minimum valid completeness score"
-    )
+    completeness_score_min: int = 1
+    completeness_score_max: int = 10
+
+    def __post_init__(self) -> None:
+        """Validate field values, normalizing the log level to upper case."""
+        log_level = self.log_level.upper()
+        if log_level not in _VALID_LOG_LEVELS:
+            raise ConfigurationError(
+                f"log_level must be one of {_VALID_LOG_LEVELS}, got '{self.log_level}'"
+            )
+        object.__setattr__(self, "log_level", log_level)
+
+        if self.bedrock_latency_mode not in _VALID_LATENCY_MODES:
+            raise ConfigurationError(
+                f"bedrock_latency_mode must be one of {_VALID_LATENCY_MODES}, "
+                f"got '{self.bedrock_latency_mode}'"
+            )
+
+        if not self.bedrock_region or len(self.bedrock_region) < 3:
+            raise ConfigurationError(f"bedrock_region appears invalid: '{self.bedrock_region}'")
+
+        for name, (low, high) in _CONFIG_BOUNDS.items():
+            value = getattr(self, name)
+            if (low is not None and value < low) or (high is not None and value > high):
+                raise ConfigurationError(f"{name} must be between {low} and {high}, got {value}")
 
-    completeness_score_max: int = Field(
-        default=10, le=10, description="Maximum valid completeness score"
-    )
-
-    @field_validator("log_level")
-    @classmethod
-    def validate_log_level(cls, v: str) -> str:
-        """Validate that log level is one of the accepted values."""
-        valid_levels = {"DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"}
-        v_upper = v.upper()
-        if v_upper not in valid_levels:
-            raise ValueError(f"log_level must be one of {valid_levels}, got '{v}'")
-        return v_upper
-
-    @field_validator("bedrock_region")
     @classmethod
-    def validate_region(cls, v: str) -> str:
-        """Validate AWS region format."""
-        if not v or len(v) < 3:
-            raise ValueError(f"bedrock_region appears invalid: '{v}'")
-        return v
-
-    model_config = {
-        "env_file": ".env",
-        "env_file_encoding": "utf-8",
-        "case_sensitive": False,
-    }
+    def from_env(cls, env_file: str = ENV_FILE) -> "Config":
+        """
+        Build a configuration from environment variables and a .env file.
+
+        Each field is read from the variable of the same name, matched case
+        insensitively (e.g. BEDROCK_MODEL_ID or bedrock_model_id); environment
+        variables take precedence over env_file, and unset fields keep their
+        default.
+
+        Args:
+            env_file: Path of an optional dotenv file
+
+        Raises:
+            ConfigurationError: If env_file sets an unknown key, or a value
+                cannot be converted or is out of range
+        """
+        names = {f.name.upper() for f in fields(cls)}
+        file_values = _read_env_file(env_file)
+        unknown = sorted(file_values.keys() - names)
+        if unknown:
+            raise ConfigurationError(f"Unknown settings in {env_file}: {', '.join(unknown)}")
+        environ = {**file_values, **{key.upper(): value for key, value in os.environ.items()}}
+
+        values: Dict[str, Any] = {}
+        for f in fields(cls):
+            raw = environ.get(f.name.upper())
+            if raw is None:
+                continue
+            try:
+                values[f.name] = f.type(raw)
+            except ValueError as e:
+                raise ConfigurationError(
+                    f"{f.name.upper()} is not a valid {f.type.__name__}: '{raw}'"
+                ) from e
+        return cls(**values)
 
     # Backward compatibility methods
     @classmethod
@@ -169,16 +255,18 @@ class EvaluationResponse(BaseModel):
     }
 
 
-# Singleton instance of configuration
-_config_instance: Optional[Config] = None
+# Built once at import so each validation reuses the compiled core validator
+_EVALUATION_ADAPTER = TypeAdapter(EvaluationResponse)
 
 
+@lru_cache(maxsize=1)
 def get_config() -> Config:
     """
     Get the singleton configuration instance.
 
-    The configuration is loaded and validated once at first access.
-    Invalid configuration will cause the application to fail fast.
+    The configuration is loaded and validated once at first access; the cached
+    instance is returned on every later call. Invalid configuration will cause
+    the application to fail fast.
 
     Returns:
         Config: The validated configuration instance
@@ -186,20 +274,17 @@ def get_config() -> Config:
     Raises:
         ConfigurationError: If configuration is invalid
     """
-    global _config_instance
-    if _config_instance is None:
-        try:
-            _config_instance = Config()
-        except ValidationError as e:
-            error_msg = f"Configuration validation failed: {e}"
-            # For Lambda environment, print to stderr and exit
-            # In other contexts, raise exception for proper handling
-            if os.environ.get("AWS_LAMBDA_FUNCTION_NAME"):
-                print(error_msg, file=sys.stderr)
-                sys.exit(1)
-            else:
-                raise ConfigurationError(error_msg) from e
-    return _config_instance
+    try:
+        return Config.from_env()
+    except ConfigurationError as e:
+        error_msg = f"Configuration validation failed: {e}"
+        # For Lambda environment, print to stderr and exit
+        # In other contexts, raise exception for proper handling
+        if os.environ.get("AWS_LAMBDA_FUNCTION_NAME"):
+            print(error_msg, file=sys.stderr)
+            sys.exit(1)
+        else:
+            raise ConfigurationError(error_msg) from e
 
 
 def validate_response_schema(response: dict) -> Tuple[bool, Optional[str]]:
@@ -213,8 +298,29 @@ def validate_response_schema(response: dict) -> Tuple[bool, Optional[str]]:
         Tuple of (is_valid, error_message)
     """
     try:
-        # Use Pydantic model for validation
-        EvaluationResponse(**response)
+        _EVALUATION_ADAPTER.validate_python(response)
         return True, None
-    except Exception as e:
+    except ValidationError as e:
         return False, str(e)
+
+
+def parse_evaluation_response(
+    content: Union[str, bytes],
+) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """
+    Parse and validate a raw JSON evaluation in a single pass.
+
+    The JSON is decoded and validated directly by pydantic-core, without an
+    intermediate Python dict.
+
+    Args:
+        content: The JSON text returned by the model
+
+    Returns:
+        Tuple of (evaluation, error_message); evaluation is None if the
+        content is not valid JSON or does not match the schema
+    """
+    try:
+        return _EVALUATION_ADAPTER.validate_json(content).model_dump(), None
+    except ValidationError as e:
+        return None, str(e)
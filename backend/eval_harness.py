@@ -4,118 +4,339 @@ Loads an evaluation dataset, calls Bedrock for each sample, compares AI output
 to expected labels, and computes accuracy metrics.
 """
 
-import json
+import functools
+import logging
 import os
+import random
 import sys
-from textwrap import dedent
-from typing import Any, Dict, List, Optional
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Optional
 
 import boto3
+import orjson
+from botocore.config import Config as BotoConfig
+from botocore.exceptions import BotoCoreError, ClientError
 
-from config import get_config, validate_response_schema
+import bedrock_batch
+import llm_cache
+from config import get_config, parse_evaluation_response
 
 # Get configuration singleton
 config = get_config()
 
-# Initialize Bedrock client using configuration
-bedrock_client = boto3.client(
-    "bedrock-runtime",
-    region_name=config.bedrock_region,
-    config=boto3.session.Config(
-        connect_timeout=config.bedrock_timeout,
-        read_timeout=config.bedrock_timeout,
-    ),
+logger = logging.getLogger(__name__)
+
+# boto3's default session is not thread-safe, so client creation is
+# serialized when several worker threads race to make the first call; the
+# client is shared by every worker once created
+_client_lock = threading.Lock()
+_bedrock_client: Any = None
+
+
+def get_concurrency() -> int:
+    """Return the number of concurrent Bedrock calls from EVAL_CONCURRENCY (default 8)."""
+    return max(1, int(os.environ.get("EVAL_CONCURRENCY", "8")))
+
+
+def _get_bedrock_client() -> Any:
+    """
+    Create the Bedrock runtime client on first use.
+
+    Deferring construction keeps credential and endpoint resolution out of
+    import, so loading the module (or failing on a missing dataset) never
+    touches AWS. The connection pool is sized to the configured concurrency
+    (never below botocore's default of 10) so every worker thread gets a warm
+    TLS connection. botocore's own retries are turned off because
+    invoke_with_retry already backs off on the errors worth retrying; with
+    both layers one throttled sample could make up to nine calls.
+    """
+    global _bedrock_client
+    if _bedrock_client is None:
+        with _client_lock:
+            # Another worker may have created the client while this one waited
+            if _bedrock_client is None:
+                _bedrock_client = boto3.client(
+                    "bedrock-runtime",
+                    region_name=config.bedrock_region,
+                    config=BotoConfig(
+                        connect_timeout=3,
+                        read_timeout=config.bedrock_timeout,
+                        max_pool_connections=max(10, get_concurrency()),
+                        retries={"max_attempts": 1, "mode": "standard"},
+                        tcp_keepalive=True,
+                    ),
+                )
+    return _bedrock_client
+
+
+# Request fields that do not depend on the prompt, built once per process
+if config.bedrock_model_id.startswith("openai."):
+    _REQUEST_SKELETON: Dict[str, Any] = {
+        "temperature": config.model_temperature,
+        "max_tokens": config.model_max_tokens,
+    }
+else:
+    _REQUEST_SKELETON = {
+        "anthropic_version": "bedrock-2023-05-31",
+        "max_tokens": config.model_max_tokens,
+        "temperature": config.model_temperature,
+    }
+
+# Bedrock errors worth retrying after a pause; the only retry layer, as the
+# client is created with botocore retries disabled
+_RETRYABLE_ERROR_CODES = {
+    "ThrottlingException",
+    "ModelTimeoutException",
+    "ServiceUnavailableException",
+}
+
+
+def disk_cached(
+    func: Callable[[str], Optional[Dict[str, Any]]],
+) -> Callable[[str], Optional[Dict[str, Any]]]:
+    """
+    Memoize a Bedrock evaluation function in the on-disk llm_cache.
+
+    Entries are keyed by the model ID, the full prompt, and the sampling
+    parameters. Caching stays on at the default non-zero temperature: the
+    harness measures the evaluator against fixed labels, and reusing one
+    sampled answer per input is what makes reruns comparable. Failed
+    evaluations (None) are not cached. Set EVAL_NO_CACHE=1 to bypass the cache
+    entirely.
+    """
+
+    @functools.wraps(func)
+    def wrapper(requirement_text: str) -> Optional[Dict[str, Any]]:
+        if os.environ.get("EVAL_NO_CACHE") == "1":
+            return func(requirement_text)
+
+        key = llm_cache.cache_key(
+            config.bedrock_model_id,
+            build_evaluation_prompt(requirement_text),
+            config.model_temperature,
+            config.model_max_tokens,
+        )
+        evaluation = llm_cache.get(key)
+        if evaluation is not None:
+            return evaluation
+
+        evaluation = func(requirement_text)
+        if evaluation is not None:
+            llm_cache.put(key, evaluation)
+        return evaluation
+
+    return wrapper
+
+
+# Left-aligned so no indentation is sent to the model; {REQ} is substituted per requirement
+_PROMPT_TEMPLATE = (
+    "You are an expert software requirements analyst. Analyze the following\n"
+    "software requirement and provide a structured evaluation.\n"
+    "\n"
+    "Requirement to evaluate:\n"
+    '"{REQ}"\n'
+    "\n"
+    "Evaluate the requirement and respond with ONLY valid JSON in this exact format:\n"
+    "{\n"
+    '"ambiguity_detected": true/false,\n'
+    '"ambiguity_details": "explanation of any ambiguous terms or phrases, or \'None\' if clear",\n'
+    '"testable": true/false,\n'
+    '"testability_details": "explanation of whether the requirement can be objectively tested",\n'
+    '"completeness_score": 1-10,\n'
+    '"completeness_details": "explanation of what information may be missing",\n'
+    '"issues": ["list", "of", "specific", "issues"],\n'
+    '"suggestions": ["list", "of", "improvement", "suggestions"]\n'
+    "}\n"
+    "\n"
+    "Respond with ONLY the JSON object, no additional text."
 )
 
 
+# The prompt is built for both the cache key and the request, and datasets
+# repeat requirements, so recent prompts and bodies are memoized
+@functools.lru_cache(maxsize=4096)
 def build_evaluation_prompt(requirement_text: str) -> str:
     """Build the prompt for Bedrock to evaluate the requirement."""
-    return dedent(
-        f"""
-        You are an expert software requirements analyst. Analyze the following
-        software requirement and provide a structured evaluation.
-
-        Requirement to evaluate:
-        "{requirement_text}"
-
-        Evaluate the requirement and respond with ONLY valid JSON in this exact format:
-        {{
-            "ambiguity_detected": true/false,
-            "ambiguity_details": "explanation of any ambiguous terms or phrases, \
-or 'None' if clear",
-            "testable": true/false,
-            "testability_details": "explanation of whether the requirement can be \
-objectively tested",
-            "completeness_score": 1-10,
-            "completeness_details": "explanation of what information may be missing",
-            "issues": ["list", "of", "specific", "issues"],
-            "suggestions": ["list", "of", "improvement", "suggestions"]
-        }}
-
-        Respond with ONLY the JSON object, no additional text.
-        """
-    ).strip()
+    return _PROMPT_TEMPLATE.replace("{REQ}", requirement_text)
+
+
+def build_request_body(prompt: str) -> Dict[str, Any]:
+    """Build the model-specific request body for a prompt."""
+    if config.bedrock_model_id.startswith("openai."):
+        return {**_REQUEST_SKELETON, "messages": [{"role": "user", "content": prompt}]}
+    return {
+        **_REQUEST_SKELETON,
+        "messages": [{"role": "user", "content": [{"type": "text", "text": prompt}]}],
+    }
+
+
+# Serialized request body with a placeholder for the prompt, so each call only
+# splices in the JSON-escaped prompt instead of rebuilding and dumping the dict
+_PROMPT_PLACEHOLDER = b'"__PROMPT__"'
+_BODY_TEMPLATE = orjson.dumps(build_request_body("__PROMPT__"))
+
+
+@functools.lru_cache(maxsize=4096)
+def encode_request_body(prompt: str) -> bytes:
+    """Encode the request body for a prompt as JSON bytes."""
+    return _BODY_TEMPLATE.replace(_PROMPT_PLACEHOLDER, orjson.dumps(prompt), 1)
+
+
+def extract_content(response_body: Dict[str, Any]) -> str:
+    """Extract the generated text from a model-specific response body."""
+    # Explicit emptiness checks avoid allocating throwaway default containers
+    if config.bedrock_model_id.startswith("openai."):
+        choices = response_body.get("choices")
+        message = choices[0].get("message") if choices else None
+        content = message.get("content", "") if message else ""
+        if isinstance(content, list):
+            content = "".join(block.get("text", "") for block in content if isinstance(block, dict))
+        return content
+    content_blocks = response_body.get("content")
+    return content_blocks[0].get("text", "") if content_blocks else ""
+
+
+def parse_evaluation(content: str) -> Optional[Dict[str, Any]]:
+    """Parse and validate the model's JSON evaluation, returning None if it is invalid."""
+    evaluation, error_msg = parse_evaluation_response(content)
+    if evaluation is None:
+        logger.warning("Invalid evaluation response: %s", error_msg)
+    return evaluation
 
 
+def invoke_with_retry(body: bytes) -> Dict[str, Any]:
+    """
+    Invoke the model, retrying throttling and transient model errors.
+
+    Retries up to BEDROCK_MAX_RETRIES times (default 2) with exponential
+    backoff and jitter, so a burst of concurrent samples hitting the account's
+    limits is slowed down instead of being counted as errors.
+
+    Args:
+        body: Encoded request body
+
+    Returns:
+        The invoke_model response
+
+    Raises:
+        ClientError: If the error is not retryable or retries are exhausted
+    """
+    max_retries = int(os.environ.get("BEDROCK_MAX_RETRIES", "2"))
+    attempt = 0
+    while True:
+        try:
+            return _get_bedrock_client().invoke_model(
+                modelId=config.bedrock_model_id,
+                contentType="application/json",
+                accept="application/json",
+                body=body,
+            )
+        except ClientError as e:
+            code = e.response.get("Error", {}).get("Code")
+            if code not in _RETRYABLE_ERROR_CODES or attempt == max_retries:
+                raise
+            delay = 2**attempt + random.random()
+            logger.warning("Bedrock %s, retrying in %.1fs", code, delay)
+            time.sleep(delay)
+            attempt += 1
+
+
+@disk_cached
 def call_bedrock(requirement_text: str) -> Optional[Dict[str, Any]]:
     """Call Amazon Bedrock to evaluate the requirement."""
     prompt = build_evaluation_prompt(requirement_text)
 
-    model_id = config.bedrock_model_id
+    response = invoke_with_retry(encode_request_body(prompt))
+    response_body = orjson.loads(response["body"].read())
+    return parse_evaluation(extract_content(response_body))
+
+
+def compare_to_expected(
+    requirement: str, expected: Dict[str, Any], ai_output: Optional[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    Compare an AI evaluation to the expected labels for a sample.
+
+    Args:
+        requirement: The requirement text that was evaluated
+        expected: Expected labels from the dataset
+        ai_output: Parsed AI evaluation, or None if it could not be parsed
+
+    Returns:
+        Dictionary with evaluation results and comparison
+    """
+    if ai_output is None:
+        return {
+            "requirement": requirement,
+            "status": "error",
+            "error": "Failed to parse AI response",
+        }
+
+    # Compare results
+    results: Dict[str, Any] = {
+        "requirement": requirement,
+        "status": "success",
+        "ai_output": ai_output,
+        "expected": expected,
+        "comparisons": {},
+    }
 
-    if model_id.startswith("openai."):
-        request_body = {
-            "messages": [{"role": "user", "content": prompt}],
-            "temperature": config.model_temperature,
-            "max_tokens": config.model_max_tokens,
+    # Compare ambiguity
+    if "ambiguity_detected" in expected:
+        ai_ambiguity = ai_output.get("ambiguity_detected")
+        expected_ambiguity = expected["ambiguity_detected"]
+        results["comparisons"]["ambiguity"] = {
+            "ai": ai_ambiguity,
+            "expected": expected_ambiguity,
+            "match": ai_ambiguity == expected_ambiguity,
         }
-    else:
-        request_body = {
-            "anthropic_version": "bedrock-2023-05-31",
-            "max_tokens": config.model_max_tokens,
-            "messages": [
-                {
-                    "role": "user",
-                    "content": [
-                        {
-                            "type": "text",
-                            "text": prompt,
-                        }
-                    ],
-                }
-            ],
-            "temperature": config.model_temperature,
+
+    # Compare testability
+    if "testable" in expected:
+        ai_testable = ai_output.get("testable")
+        expected_testable = expected["testable"]
+        results["comparisons"]["testability"] = {
+            "ai": ai_testable,
+            "expected": expected_testable,
+            "match": ai_testable == expected_testable,
         }
 
-    response = bedrock_client.invoke_model(
-        modelId=model_id,
-        contentType="application/json",
-        accept="application/json",
-        body=json.dumps(request_body),
-    )
+    # Compare completeness (within threshold)
+    if "completeness_score" in expected:
+        ai_score = ai_output.get("completeness_score", 0)
+        expected_score = expected["completeness_score"]
+        threshold = expected.get("completeness_threshold", 2)
+        within_threshold = abs(ai_score - expected_score) <= threshold
+        results["comparisons"]["completeness"] = {
+            "ai": ai_score,
+            "expected": expected_score,
+            "threshold": threshold,
+            "within_threshold": within_threshold,
+        }
 
-    response_body = json.loads(response["body"].read())
+    return results
 
-    if model_id.startswith("openai."):
-        first_choice = response_body.get("choices", [{}])[0]
-        message = first_choice.get("message", {})
-        content = message.get("content", "")
-        if isinstance(content, list):
-            content = "".join(block.get("text", "") for block in content if isinstance(block, dict))
-    else:
-        content = response_body.get("content", [{}])[0].get("text", "")
 
-    try:
-        evaluation = json.loads(content)
+def skip_reason(requirement: str) -> Optional[str]:
+    """
+    Return why a requirement should not be sent to Bedrock, or None to evaluate it.
+
+    Uses the same length limits the API enforces, so inputs the deployed
+    evaluator would reject never cost a model call.
+    """
+    if len(requirement.strip()) < config.min_requirement_length:
+        return f"shorter than {config.min_requirement_length} characters"
+    if len(requirement) > config.max_requirement_length:
+        return f"longer than {config.max_requirement_length} characters"
+    return None
 
-        # Validate the response schema
-        is_valid, error_msg = validate_response_schema(evaluation)
-        if not is_valid:
-            print(f"Warning: Schema validation failed: {error_msg}")
 
-        return evaluation
-    except json.JSONDecodeError:
-        return None
+def _skipped_result(requirement: str, reason: str) -> Dict[str, Any]:
+    """Build the result for a sample that was not sent to Bedrock."""
+    return {"requirement": requirement, "status": "skipped", "reason": reason}
 
 
 def evaluate_sample(sample: Dict[str, Any]) -> Dict[str, Any]:
@@ -131,126 +352,208 @@ def evaluate_sample(sample: Dict[str, Any]) -> Dict[str, Any]:
     requirement = sample.get("requirement", "")
     expected = sample.get("expected", {})
 
-    print(f"\nEvaluating: {requirement[:60]}...")
+    reason = skip_reason(requirement)
+    if reason is not None:
+        return _skipped_result(requirement, reason)
 
+    # Only AWS and response-decoding failures are recorded as sample errors;
+    # anything else is a harness bug and propagates out of the run
     try:
-        ai_output = call_bedrock(requirement)
-
-        if ai_output is None:
-            return {
-                "requirement": requirement,
-                "status": "error",
-                "error": "Failed to parse AI response",
-            }
-
-        # Compare results
-        results = {
+        return compare_to_expected(requirement, expected, call_bedrock(requirement))
+    except (ClientError, BotoCoreError) as e:
+        return {
             "requirement": requirement,
-            "status": "success",
-            "ai_output": ai_output,
-            "expected": expected,
-            "comparisons": {},
+            "status": "error",
+            "error": f"bedrock: {e}",
         }
-
-        # Compare ambiguity
-        if "ambiguity_detected" in expected:
-            ai_ambiguity = ai_output.get("ambiguity_detected")
-            expected_ambiguity = expected["ambiguity_detected"]
-            results["comparisons"]["ambiguity"] = {
-                "ai": ai_ambiguity,
-                "expected": expected_ambiguity,
-                "match": ai_ambiguity == expected_ambiguity,
-            }
-
-        # Compare testability
-        if "testable" in expected:
-            ai_testable = ai_output.get("testable")
-            expected_testable = expected["testable"]
-            results["comparisons"]["testability"] = {
-                "ai": ai_testable,
-                "expected": expected_testable,
-                "match": ai_testable == expected_testable,
-            }
-
-        # Compare completeness (within threshold)
-        if "completeness_score" in expected:
-            ai_score = ai_output.get("completeness_score", 0)
-            expected_score = expected["completeness_score"]
-            threshold = expected.get("completeness_threshold", 2)
-            within_threshold = abs(ai_score - expected_score) <= threshold
-            results["comparisons"]["completeness"] = {
-                "ai": ai_score,
-                "expected": expected_score,
-                "threshold": threshold,
-                "within_threshold": within_threshold,
-            }
-
-        return results
-
-    except Exception as e:  # noqa: BLE001
+    except orjson.JSONDecodeError as e:
         return {
             "requirement": requirement,
             "status": "error",
-            "error": str(e),
+            "error": f"decode: {e}",
+        }
+
+
+def _reuse_result(result: Dict[str, Any], sample: Dict[str, Any]) -> Dict[str, Any]:
+    """Apply one requirement's evaluation to a duplicate sample's expected labels."""
+    if result["status"] != "success":
+        return dict(result)
+    return compare_to_expected(
+        result["requirement"], sample.get("expected", {}), result["ai_output"]
+    )
+
+
+def evaluate_samples(
+    samples: List[Dict[str, Any]],
+    concurrency: int,
+    on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Evaluate samples concurrently, preserving dataset order in the results.
+
+    Bedrock calls are network-bound and boto3 releases the GIL while waiting
+    on the socket, so a thread pool overlaps the round-trips. With
+    EVAL_DEDUP=1, samples sharing a requirement text are evaluated once and
+    the result is compared against each sample's own expected labels; this is
+    off by default because repeated samples are also used to measure how
+    consistent the model is.
+
+    Args:
+        samples: List of sample dictionaries
+        concurrency: Maximum number of in-flight Bedrock calls
+        on_result: Optional callback invoked with each result as it completes
+
+    Returns:
+        List of evaluation results in the same order as samples
+    """
+    # Indices of the samples answered by each evaluation
+    if os.environ.get("EVAL_DEDUP") == "1":
+        groups: Dict[str, List[int]] = {}
+        for index, sample in enumerate(samples):
+            groups.setdefault(sample.get("requirement", ""), []).append(index)
+        index_groups = list(groups.values())
+    else:
+        index_groups = [[index] for index in range(len(samples))]
+
+    results: List[Any] = [None] * len(samples)
+    completed = 0
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = {
+            executor.submit(evaluate_sample, samples[group[0]]): group for group in index_groups
         }
+        for future in as_completed(futures):
+            group = futures[future]
+            first = future.result()
+            for index in group:
+                result = first if index == group[0] else _reuse_result(first, samples[index])
+                results[index] = result
+                completed += 1
+                if on_result is not None:
+                    on_result(result)
+                logger.info(
+                    "[%d/%d] %s: %s...",
+                    completed,
+                    len(samples),
+                    result["status"],
+                    result["requirement"][:60],
+                )
+
+    return results
+
+
+def run_batch(
+    samples: List[Dict[str, Any]],
+    bucket: str,
+    role_arn: str,
+    prefix: str = "eval-batch",
+    poll_seconds: int = 60,
+) -> List[Dict[str, Any]]:
+    """
+    Evaluate samples with a single Bedrock batch inference job.
+
+    Each sample's request body becomes one record of the job, and the output
+    records are compared to the expected labels exactly like synchronous
+    results. Samples that would be skipped are not submitted.
+
+    Args:
+        samples: List of sample dictionaries
+        bucket: S3 bucket for the job input and output
+        role_arn: Service role Bedrock assumes to read and write the bucket
+        prefix: Key prefix for job files within the bucket
+        poll_seconds: Delay between job status checks
+
+    Returns:
+        List of evaluation results in the same order as samples
+
+    Raises:
+        RuntimeError: If the job does not complete
+    """
+    reasons = [skip_reason(sample.get("requirement", "")) for sample in samples]
+    model_inputs = {
+        f"{i:011d}": build_request_body(build_evaluation_prompt(sample.get("requirement", "")))
+        for i, sample in enumerate(samples)
+        if reasons[i] is None
+    }
+    # A job with no records would be rejected, so only submit when needed
+    outputs = {}
+    if model_inputs:
+        outputs = bedrock_batch.run_job(model_inputs, bucket, role_arn, prefix, poll_seconds)
+
+    results = []
+    for i, sample in enumerate(samples):
+        requirement = sample.get("requirement", "")
+        if reasons[i] is not None:
+            results.append(_skipped_result(requirement, reasons[i]))
+            continue
+        record = outputs.get(f"{i:011d}", {})
+        if "modelOutput" not in record:
+            results.append(
+                {
+                    "requirement": requirement,
+                    "status": "error",
+                    "error": f"Batch record failed: {record.get('error', 'no output')}",
+                }
+            )
+            continue
+        ai_output = parse_evaluation(extract_content(record["modelOutput"]))
+        results.append(compare_to_expected(requirement, sample.get("expected", {}), ai_output))
 
+    return results
 
-def compute_metrics(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+
+# Confusion-matrix cell for each (ai, expected) pair of boolean labels
+_CONFUSION_CELLS = {
+    (True, True): "tp",
+    (False, False): "tn",
+    (True, False): "fp",
+    (False, True): "fn",
+}
+
+
+def compute_metrics(results: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
     """
     Compute accuracy metrics from evaluation results.
 
     Args:
-        results: List of evaluation result dictionaries
+        results: Evaluation result dictionaries; any iterable, consumed once
 
     Returns:
         Dictionary with computed metrics
     """
-    metrics = {
-        "total_samples": len(results),
+    counts = {"ambiguity": Counter(), "testability": Counter()}
+
+    metrics: Dict[str, Any] = {
+        "total_samples": 0,
         "successful_evaluations": 0,
         "errors": 0,
-        "ambiguity": {"tp": 0, "tn": 0, "fp": 0, "fn": 0},
-        "testability": {"tp": 0, "tn": 0, "fp": 0, "fn": 0},
+        "skipped": 0,
+        "ambiguity": {},
+        "testability": {},
         "completeness": {"within_threshold": 0, "outside_threshold": 0},
     }
 
     for result in results:
-        if result.get("status") == "error":
+        metrics["total_samples"] += 1
+        status = result.get("status")
+        if status == "error":
             metrics["errors"] += 1
             continue
+        if status == "skipped":
+            metrics["skipped"] += 1
+            continue
 
         metrics["successful_evaluations"] += 1
         comparisons = result.get("comparisons", {})
 
-        # Ambiguity metrics
-        if "ambiguity" in comparisons:
-            amb = comparisons["ambiguity"]
-            ai_val = amb.get("ai")
-            exp_val = amb.get("expected")
-
-            if ai_val is True and exp_val is True:
-                metrics["ambiguity"]["tp"] += 1
-            elif ai_val is False and exp_val is False:
-                metrics["ambiguity"]["tn"] += 1
-            elif ai_val is True and exp_val is False:
-                metrics["ambiguity"]["fp"] += 1
-            elif ai_val is False and exp_val is True:
-                metrics["ambiguity"]["fn"] += 1
-
-        # Testability metrics
-        if "testability" in comparisons:
-            test = comparisons["testability"]
-            ai_val = test.get("ai")
-            exp_val = test.get("expected")
-
-            if ai_val is True and exp_val is True:
-                metrics["testability"]["tp"] += 1
-            elif ai_val is False and exp_val is False:
-                metrics["testability"]["tn"] += 1
-            elif ai_val is True and exp_val is False:
-                metrics["testability"]["fp"] += 1
-            elif ai_val is False and exp_val is True:
-                metrics["testability"]["fn"] += 1
+        # Ambiguity and testability metrics; only pairs of real booleans are
+        # counted, since 1 and 0 would otherwise hash equal to True and False
+        for category, category_counts in counts.items():
+            comparison = comparisons.get(category)
+            if comparison is None:
+                continue
+            ai, expected = comparison.get("ai"), comparison.get("expected")
+            if type(ai) is bool and type(expected) is bool:
+                category_counts[_CONFUSION_CELLS[(ai, expected)]] += 1
 
         # Completeness metrics
         if "completeness" in comparisons:
@@ -261,9 +564,10 @@ def compute_metrics(results: List[Dict[str, Any]]) -> Dict[str, Any]:
                 metrics["completeness"]["outside_threshold"] += 1
 
     # Calculate accuracy rates
-    for category in ["ambiguity", "testability"]:
-        cat_metrics = metrics[category]
-        total = cat_metrics["tp"] + cat_metrics["tn"] + cat_metrics["fp"] + cat_metrics["fn"]
+    for category, category_counts in counts.items():
+        cat_metrics = {cell: category_counts[cell] for cell in ("tp", "tn", "fp", "fn")}
+        metrics[category] = cat_metrics
+        total = category_counts.total()
         if total > 0:
             cat_metrics["accuracy"] = (cat_metrics["tp"] + cat_metrics["tn"]) / total
             cat_metrics["precision"] = (
@@ -291,78 +595,189 @@ def compute_metrics(results: List[Dict[str, Any]]) -> Dict[str, Any]:
 
 def print_results(metrics: Dict[str, Any]) -> None:
     """Print formatted evaluation results."""
-    print("\n" + "=" * 60)
-    print("EVALUATION RESULTS")
-    print("=" * 60)
-
-    print(f"\nTotal samples: {metrics['total_samples']}")
-    print(f"Successful evaluations: {metrics['successful_evaluations']}")
-    print(f"Errors: {metrics['errors']}")
-
-    print("\n--- Ambiguity Detection ---")
-    amb = metrics["ambiguity"]
-    print(f"  True Positives:  {amb['tp']}")
-    print(f"  True Negatives:  {amb['tn']}")
-    print(f"  False Positives: {amb['fp']}")
-    print(f"  False Negatives: {amb['fn']}")
-    if "accuracy" in amb:
-        print(f"  Accuracy:  {amb['accuracy']:.2%}")
-        print(f"  Precision: {amb['precision']:.2%}")
-        print(f"  Recall:    {amb['recall']:.2%}")
-
-    print("\n--- Testability Detection ---")
-    test = metrics["testability"]
-    print(f"  True Positives:  {test['tp']}")
-    print(f"  True Negatives:  {test['tn']}")
-    print(f"  False Positives: {test['fp']}")
-    print(f"  False Negatives: {test['fn']}")
-    if "accuracy" in test:
-        print(f"  Accuracy:  {test['accuracy']:.2%}")
-        print(f"  Precision: {test['precision']:.2%}")
-        print(f"  Recall:    {test['recall']:.2%}")
-
-    print("\n--- Completeness Score ---")
+    lines = [
+        "",
+        "=" * 60,
+        "EVALUATION RESULTS",
+        "=" * 60,
+        "",
+        f"Total samples: {metrics['total_samples']}",
+        f"Successful evaluations: {metrics['successful_evaluations']}",
+        f"Errors: {metrics['errors']}",
+        f"Skipped: {metrics['skipped']}",
+    ]
+
+    for title, category in (
+        ("Ambiguity Detection", metrics["ambiguity"]),
+        ("Testability Detection", metrics["testability"]),
+    ):
+        lines += [
+            "",
+            f"--- {title} ---",
+            f"  True Positives:  {category['tp']}",
+            f"  True Negatives:  {category['tn']}",
+            f"  False Positives: {category['fp']}",
+            f"  False Negatives: {category['fn']}",
+        ]
+        if "accuracy" in category:
+            lines += [
+                f"  Accuracy:  {category['accuracy']:.2%}",
+                f"  Precision: {category['precision']:.2%}",
+                f"  Recall:    {category['recall']:.2%}",
+            ]
+
     comp = metrics["completeness"]
-    print(f"  Within threshold:  {comp['within_threshold']}")
-    print(f"  Outside threshold: {comp['outside_threshold']}")
+    lines += [
+        "",
+        "--- Completeness Score ---",
+        f"  Within threshold:  {comp['within_threshold']}",
+        f"  Outside threshold: {comp['outside_threshold']}",
+    ]
     if "accuracy" in comp:
-        print(f"  Accuracy: {comp['accuracy']:.2%}")
+        lines.append(f"  Accuracy: {comp['accuracy']:.2%}")
+
+    lines += ["", "=" * 60, ""]
+
+    # One write for the whole report instead of a flush per line
+    sys.stdout.write("\n".join(lines))
+    sys.stdout.flush()
+
+
+# Parsed dataset keyed by (path, mtime_ns, size); drivers that run the harness
+# repeatedly in one process skip re-reading an unchanged file
+_dataset_cache: Dict[tuple, List[Dict[str, Any]]] = {}
+
+
+def load_samples(dataset_path: str) -> List[Dict[str, Any]]:
+    """
+    Load evaluation samples from a dataset file.
+
+    Files ending in .jsonl are read line by line with one sample per line;
+    any other file is parsed as a JSON document with a "samples" array. The
+    last parsed dataset is reused while the file is unchanged.
+
+    Args:
+        dataset_path: Path to the dataset file
+
+    Returns:
+        List of sample dictionaries
+    """
+    st = os.stat(dataset_path)
+    key = (dataset_path, st.st_mtime_ns, st.st_size)
+    samples = _dataset_cache.get(key)
+    if samples is None:
+        if dataset_path.endswith(".jsonl"):
+            with open(dataset_path, "rb") as f:
+                samples = [orjson.loads(line) for line in f if line.strip()]
+        else:
+            with open(dataset_path, "rb") as f:
+                samples = orjson.loads(f.read()).get("samples", [])
+        _dataset_cache.clear()
+        _dataset_cache[key] = samples
+    # A fresh list so callers can reorder or filter without touching the cache
+    return list(samples)
+
+
+def load_results(results_path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Stream evaluation results back from a JSONL results file.
 
-    print("\n" + "=" * 60)
+    Results are yielded one at a time, so a large run can be re-scored with
+    compute_metrics(load_results(path)) without loading the whole file.
+
+    Args:
+        results_path: Path to a results file written with EVAL_OUTPUT=*.jsonl
+
+    Yields:
+        Evaluation result dictionaries in file order
+    """
+    with open(results_path, "rb") as f:
+        for line in f:
+            if line.strip():
+                yield orjson.loads(line)
+
+
+def write_jsonl_record(f: IO[bytes], record: Dict[str, Any]) -> None:
+    """Append a record to an open JSONL file and flush it to disk."""
+    f.write(orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE))
+    f.flush()
 
 
 def main() -> None:
     """Main entry point for the evaluation harness."""
+    logging.basicConfig(level=config.log_level, format="%(message)s", stream=sys.stdout)
+
     # Load dataset
     dataset_path = os.environ.get("EVAL_DATASET", "eval_dataset.json")
 
     if not os.path.exists(dataset_path):
-        print(f"Error: Dataset file not found: {dataset_path}")
+        logger.error("Error: Dataset file not found: %s", dataset_path)
         sys.exit(1)
 
-    with open(dataset_path, "r", encoding="utf-8") as f:
-        dataset = json.load(f)
+    samples = load_samples(dataset_path)
+    logger.info("Loaded %d samples from %s", len(samples), dataset_path)
 
-    samples = dataset.get("samples", [])
-    print(f"Loaded {len(samples)} samples from {dataset_path}")
-
-    # Evaluate each sample
-    results = []
-    for i, sample in enumerate(samples, 1):
-        print(f"\n[{i}/{len(samples)}]", end="")
-        result = evaluate_sample(sample)
-        results.append(result)
+    concurrency = get_concurrency()
+    output_path = os.environ.get("EVAL_OUTPUT")
+    stream_output = bool(output_path) and output_path.endswith(".jsonl")
+
+    use_batch = os.environ.get("EVAL_MODE") == "batch"
+    batch_min_samples = int(os.environ.get("EVAL_BATCH_MIN_SAMPLES", "100"))
+    if use_batch and len(samples) < batch_min_samples:
+        logger.info(
+            "Only %d samples (batch minimum %d); using synchronous evaluation",
+            len(samples),
+            batch_min_samples,
+        )
+        use_batch = False
+
+    if use_batch:
+        bucket = os.environ.get("EVAL_BATCH_BUCKET")
+        role_arn = os.environ.get("EVAL_BATCH_ROLE_ARN")
+        if not bucket or not role_arn:
+            logger.error(
+                "Error: EVAL_MODE=batch requires EVAL_BATCH_BUCKET and EVAL_BATCH_ROLE_ARN"
+            )
+            sys.exit(1)
+        results = run_batch(
+            samples,
+            bucket,
+            role_arn,
+            prefix=os.environ.get("EVAL_BATCH_PREFIX", "eval-batch"),
+            poll_seconds=int(os.environ.get("EVAL_BATCH_POLL_SECONDS", "60")),
+        )
+        if stream_output:
+            with open(output_path, "wb") as out:
+                for result in results:
+                    write_jsonl_record(out, result)
+    elif stream_output:
+        # Stream each result to disk as it completes so partial progress
+        # survives a crash; metrics go to a sidecar file at the end
+        with open(output_path, "wb") as out:
+            results = evaluate_samples(
+                samples, concurrency, on_result=lambda result: write_jsonl_record(out, result)
+            )
+    else:
+        # Evaluate samples concurrently; the Bedrock round-trip dominates runtime
+        results = evaluate_samples(samples, concurrency)
 
     # Compute and print metrics
     metrics = compute_metrics(results)
     print_results(metrics)
 
     # Optionally save detailed results
-    output_path = os.environ.get("EVAL_OUTPUT")
-    if output_path:
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump({"results": results, "metrics": metrics}, f, indent=2)
-        print(f"\nDetailed results saved to: {output_path}")
+    if stream_output:
+        metrics_path = os.path.splitext(output_path)[0] + ".metrics.json"
+        with open(metrics_path, "wb") as f:
+            f.write(orjson.dumps(metrics, option=orjson.OPT_INDENT_2))
+        logger.info("Detailed results saved to: %s", output_path)
+        logger.info("Metrics saved to: %s", metrics_path)
+    elif output_path:
+        # Written compactly; large runs spend most of the dump on indentation.
+        # Pretty-print on demand with `jq . <file>`.
+        with open(output_path, "wb") as f:
+            f.write(orjson.dumps({"results": results, "metrics": metrics}))
+        logger.info("Detailed results saved to: %s", output_path)
 
 
 if __name__ == "__main__":
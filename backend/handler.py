@@ -6,19 +6,28 @@ validates input, checks rate limits, calls Amazon Bedrock (Claude 3 Haiku),
 and returns structured evaluation results.
 """
 
-import json
 import logging
+import os
+import re
 import time
+from collections import OrderedDict
 from textwrap import dedent
 from typing import Any, Dict, Tuple
 
 import boto3
+import orjson
+from botocore.config import Config as BotoConfig
 from botocore.exceptions import ClientError
 
 from config import get_config, validate_response_schema
 from logging_utils import StructuredLogger
 from rate_limit import check_and_increment_quota
 
+# Pin TZ before any logging so glibc does not stat /etc/localtime on every
+# timestamp conversion when the variable is unset
+os.environ.setdefault("TZ", ":/etc/localtime")
+time.tzset()
+
 # Get configuration singleton
 config = get_config()
 
@@ -27,16 +36,65 @@ base_logger = logging.getLogger()
 base_logger.setLevel(config.log_level)
 logger = StructuredLogger(base_logger)
 
-# Initialize Bedrock client using configuration
+# Initialize Bedrock client using configuration. TCP keep-alive keeps the pooled
+# HTTPS connection alive between warm invocations so they skip the TLS
+# handshake, and a single standard-mode retry keeps a slow call inside the
+# Lambda timeout.
 bedrock_client = boto3.client(
     "bedrock-runtime",
     region_name=config.bedrock_region,
-    config=boto3.session.Config(
+    config=BotoConfig(
         connect_timeout=config.bedrock_timeout,
         read_timeout=config.bedrock_timeout,
+        tcp_keepalive=True,
+        retries={"mode": "standard", "max_attempts": 2},
     ),
 )
 
+# Evaluations of recently seen requirements, reused across warm invocations of
+# this container; the model and prompt are fixed per deployment, so the text
+# alone identifies an evaluation
+EVALUATION_CACHE_SIZE = 1024
+_evaluation_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+# Requirements that are only a placeholder are answered without a Bedrock call;
+# the pattern must match the whole text, so a real requirement that merely
+# mentions one of these words still goes to the model. Tokens are separated by
+# \W+ rather than each carrying its own \W*, so there is only one way to split
+# the text and a failed match backtracks in linear time.
+_PLACEHOLDER_TOKEN = (
+    r"(?:tb[adc]|to be (?:determined|decided|defined|confirmed|added)|n/?a|not applicable"
+    r"|to ?do|placeholder|do (?:something|stuff)|fill (?:this )?in(?: later)?|x{3,})\b"
+)
+_PLACEHOLDER_PATTERN = re.compile(
+    rf"\W*{_PLACEHOLDER_TOKEN}(?:\W+{_PLACEHOLDER_TOKEN})*\W*", re.IGNORECASE
+)
+
+# Filler text is recognised by vocabulary rather than by its "lorem ipsum"
+# prefix, so a real requirement written after the filler still goes to the model
+_LOREM_IPSUM_WORDS = frozenset(
+    """
+    lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor
+    incididunt ut labore et dolore magna aliqua enim ad minim veniam quis nostrud
+    exercitation ullamco laboris nisi aliquip ex ea commodo consequat duis aute irure
+    in reprehenderit voluptate velit esse cillum eu fugiat nulla pariatur excepteur
+    sint occaecat cupidatat non proident sunt culpa qui officia deserunt mollit anim
+    id est laborum
+    """.split()
+)
+_WORD_PATTERN = re.compile(r"\w+")
+
+PLACEHOLDER_EVALUATION = {
+    "ambiguity_detected": True,
+    "ambiguity_details": "The text is a placeholder rather than a requirement",
+    "testable": False,
+    "testability_details": "A placeholder describes no behavior that could be tested",
+    "completeness_score": config.completeness_score_min,
+    "completeness_details": "No requirement has been written yet",
+    "issues": ["Requirement text is a placeholder"],
+    "suggestions": ["Describe what the system shall do and how it will be verified"],
+}
+
 # CORS headers for API Gateway responses
 CORS_HEADERS = {
     "Access-Control-Allow-Origin": "*",
@@ -46,9 +104,30 @@ CORS_HEADERS = {
 }
 
 
+def elapsed_seconds(start_ns: int) -> float:
+    """Return the seconds elapsed since a time.monotonic_ns() reading, to 10ms."""
+    return round((time.monotonic_ns() - start_ns) / 1e9, 2)
+
+
 def create_response(status_code: int, body: Dict[str, Any]) -> Dict[str, Any]:
     """Create a properly formatted API Gateway response."""
-    return {"statusCode": status_code, "headers": CORS_HEADERS, "body": json.dumps(body)}
+    return {"statusCode": status_code, "headers": CORS_HEADERS, "body": orjson.dumps(body).decode()}
+
+
+# Responses whose bodies never change, serialized once at import
+OPTIONS_RESPONSE = create_response(200, {"message": "OK"})
+METHOD_NOT_ALLOWED_RESPONSE = create_response(405, {"error": "Method not allowed"})
+EMPTY_BODY_RESPONSE = create_response(400, {"error": "Request body is required"})
+INVALID_JSON_RESPONSE = create_response(400, {"error": "Invalid JSON in request body"})
+INTERNAL_ERROR_RESPONSE = create_response(500, {"error": "Internal server error"})
+
+
+def is_placeholder(text: str) -> bool:
+    """Check whether a requirement is only placeholder or lorem ipsum filler text."""
+    if _PLACEHOLDER_PATTERN.fullmatch(text):
+        return True
+    words = _WORD_PATTERN.findall(text.lower())
+    return words[:2] == ["lorem", "ipsum"] and _LOREM_IPSUM_WORDS.issuperset(words)
 
 
 def validate_request(body: Dict[str, Any]) -> Tuple[bool, str]:
@@ -72,10 +151,13 @@ def validate_request(body: Dict[str, Any]) -> Tuple[bool, str]:
     if not isinstance(requirement_text, str):
         return False, "requirementText must be a string"
 
-    if len(requirement_text.strip()) == 0:
+    # Strip once; the minimum applies to the stripped text, the maximum to the raw text
+    stripped_length = len(requirement_text.strip())
+
+    if stripped_length == 0:
         return False, "requirementText cannot be empty"
 
-    if len(requirement_text.strip()) < config.min_requirement_length:
+    if stripped_length < config.min_requirement_length:
         return False, f"requirementText must be at least {config.min_requirement_length} characters"
 
     if len(requirement_text) > config.max_requirement_length:
@@ -87,6 +169,42 @@ def validate_request(body: Dict[str, Any]) -> Tuple[bool, str]:
     return True, ""
 
 
+# The prompt is dedented once at import; {req} is substituted per request
+_PROMPT_TEMPLATE = dedent(
+    """
+    You are an expert software requirements analyst. Analyze the following
+    software requirement and provide a structured evaluation.
+
+    Requirement to evaluate:
+    "{req}"
+
+    Evaluate the requirement and respond with ONLY valid JSON in this exact format:
+    {{
+        "ambiguity_detected": true/false,
+        "ambiguity_details": "explanation of any ambiguous terms or phrases, \
+or 'None' if clear",
+        "testable": true/false,
+        "testability_details": "explanation of whether the requirement can be \
+objectively tested",
+        "completeness_score": 1-10,
+        "completeness_details": "explanation of what information may be missing",
+        "issues": ["list", "of", "specific", "issues"],
+        "suggestions": ["list", "of", "improvement", "suggestions"]
+    }}
+
+    Important guidelines:
+    - ambiguity_detected: true if the requirement contains vague, unclear, or \
+subjective language
+    - testable: true if the requirement has measurable, verifiable \
+acceptance criteria
+    - completeness_score: 1 (very incomplete) to 10 (fully complete)
+    - Be specific and actionable in your feedback
+
+    Respond with ONLY the JSON object, no additional text.
+    """
+).strip()
+
+
 def build_evaluation_prompt(requirement_text: str) -> str:
     """
     Build the prompt for Bedrock to evaluate the requirement.
@@ -97,39 +215,112 @@ def build_evaluation_prompt(requirement_text: str) -> str:
     Returns:
         Formatted prompt string
     """
-    return dedent(
-        f"""
-        You are an expert software requirements analyst. Analyze the following
-        software requirement and provide a structured evaluation.
-
-        Requirement to evaluate:
-        "{requirement_text}"
-
-        Evaluate the requirement and respond with ONLY valid JSON in this exact format:
-        {{
-            "ambiguity_detected": true/false,
-            "ambiguity_details": "explanation of any ambiguous terms or phrases, \
-or 'None' if clear",
-            "testable": true/false,
-            "testability_details": "explanation of whether the requirement can be \
-objectively tested",
-            "completeness_score": 1-10,
-            "completeness_details": "explanation of what information may be missing",
-            "issues": ["list", "of", "specific", "issues"],
-            "suggestions": ["list", "of", "improvement", "suggestions"]
-        }}
-
-        Important guidelines:
-        - ambiguity_detected: true if the requirement contains vague, unclear, or \
-subjective language
-        - testable: true if the requirement has measurable, verifiable \
-acceptance criteria
-        - completeness_score: 1 (very incomplete) to 10 (fully complete)
-        - Be specific and actionable in your feedback
+    return _PROMPT_TEMPLATE.format(req=requirement_text)
+
+
+# The model is fixed for the container's lifetime, so its request and response
+# formats are resolved once at import rather than on every call
+_IS_OPENAI = config.bedrock_model_id.startswith("openai.")
+
+
+def _build_openai_body(prompt: str) -> Dict[str, Any]:
+    """Build an OpenAI-format request body for a prompt."""
+    return {
+        "messages": [{"role": "user", "content": prompt}],
+        "temperature": config.model_temperature,
+        "max_tokens": config.model_max_tokens,
+    }
+
+
+def _build_anthropic_body(prompt: str) -> Dict[str, Any]:
+    """Build an Anthropic-format request body for a prompt."""
+    return {
+        "anthropic_version": "bedrock-2023-05-31",
+        "max_tokens": config.model_max_tokens,
+        "messages": [{"role": "user", "content": [{"type": "text", "text": prompt}]}],
+        "temperature": config.model_temperature,
+    }
+
+
+def _extract_openai_content(response_body: Dict[str, Any]) -> str:
+    """Extract the generated text from an OpenAI-format response body."""
+    # OpenAI models return choices[0].message.content (string or list)
+    choices = response_body.get("choices")
+    message = choices[0].get("message") if choices else None
+    content = message.get("content", "") if message else ""
+    if isinstance(content, list):
+        # concatenate text entries if provided as a list of content blocks
+        content = "".join(block.get("text", "") for block in content if isinstance(block, dict))
+    return content
+
+
+def _extract_anthropic_content(response_body: Dict[str, Any]) -> str:
+    """Extract the generated text from an Anthropic-format response body."""
+    content_blocks = response_body.get("content")
+    return content_blocks[0].get("text", "") if content_blocks else ""
+
 
-        Respond with ONLY the JSON object, no additional text.
-        """
-    ).strip()
+_build_body = _build_openai_body if _IS_OPENAI else _build_anthropic_body
+_extract_content = _extract_openai_content if _IS_OPENAI else _extract_anthropic_content
+
+# Serialized request body with a placeholder for the prompt, so each call only
+# splices in the JSON-escaped prompt instead of rebuilding and dumping the dict
+_PROMPT_PLACEHOLDER = b'"__PROMPT__"'
+_BODY_TEMPLATE = orjson.dumps(_build_body("__PROMPT__"))
+
+
+def encode_request_body(prompt: str) -> bytes:
+    """Encode the request body for a prompt as JSON bytes."""
+    return _BODY_TEMPLATE.replace(_PROMPT_PLACEHOLDER, orjson.dumps(prompt), 1)
+
+
+# Set once the model rejects latency-optimized inference, so the rest of this
+# container's requests go straight to standard mode instead of paying for a
+# rejected call each time
+_latency_optimized_rejected = False
+
+
+def invoke_model(model_id: str, body: bytes) -> Dict[str, Any]:
+    """
+    Invoke the Bedrock model in the configured latency mode.
+
+    Models without latency-optimized inference reject the request with a
+    ValidationException naming the latency configuration; the call is then
+    retried in standard mode, and standard mode is used for the rest of the
+    container's lifetime.
+
+    Args:
+        model_id: Bedrock model ID
+        body: JSON request body
+
+    Returns:
+        The invoke_model response
+    """
+    request = {
+        "modelId": model_id,
+        "contentType": "application/json",
+        "accept": "application/json",
+        "body": body,
+    }
+
+    global _latency_optimized_rejected
+
+    if config.bedrock_latency_mode == "optimized" and not _latency_optimized_rejected:
+        try:
+            return bedrock_client.invoke_model(performanceConfigLatency="optimized", **request)
+        except ClientError as e:
+            error = e.response.get("Error", {})
+            message = error.get("Message", "").lower()
+            if error.get("Code") != "ValidationException" or "latency" not in message:
+                raise
+            _latency_optimized_rejected = True
+            logger.warning(
+                "Latency-optimized inference rejected, using standard mode",
+                model_id=model_id,
+                error_message=str(e),
+            )
+
+    return bedrock_client.invoke_model(**request)
 
 
 def call_bedrock(requirement_text: str) -> Dict[str, Any]:
@@ -145,79 +336,65 @@ def call_bedrock(requirement_text: str) -> Dict[str, Any]:
     Raises:
         Exception: If Bedrock call fails or response cannot be parsed
     """
-    start_time = time.time()
-    prompt = build_evaluation_prompt(requirement_text)
-
     model_id = config.bedrock_model_id
 
-    # Prepare request body depending on the selected model family
-    if model_id.startswith("openai."):
-        request_body = {
-            "messages": [{"role": "user", "content": prompt}],
-            "temperature": config.model_temperature,
-            "max_tokens": config.model_max_tokens,
-        }
-    else:
-        # Default to Anthropic format
-        request_body = {
-            "anthropic_version": "bedrock-2023-05-31",
-            "max_tokens": config.model_max_tokens,
-            "messages": [{"role": "user", "content": [{"type": "text", "text": prompt}]}],
-            "temperature": config.model_temperature,
-        }
+    if is_placeholder(requirement_text):
+        logger.info("Placeholder requirement, skipping Bedrock", model_id=model_id)
+        return PLACEHOLDER_EVALUATION
+
+    cached = _evaluation_cache.get(requirement_text)
+    if cached is not None:
+        _evaluation_cache.move_to_end(requirement_text)
+        logger.info("Bedrock evaluation served from cache", model_id=model_id, cache_hit=True)
+        return cached
+
+    start_ns = time.monotonic_ns()
+    prompt = build_evaluation_prompt(requirement_text)
 
     logger.info(
         "Calling Bedrock model",
         model_id=model_id,
         temperature=config.model_temperature,
         max_tokens=config.model_max_tokens,
+        latency_mode=config.bedrock_latency_mode,
     )
 
     try:
-        response = bedrock_client.invoke_model(
-            modelId=model_id,
-            contentType="application/json",
-            accept="application/json",
-            body=json.dumps(request_body),
-        )
+        response = invoke_model(model_id, encode_request_body(prompt))
 
-        duration = time.time() - start_time
         logger.info(
-            "Bedrock call completed", model_id=model_id, duration_seconds=round(duration, 2)
+            "Bedrock call completed",
+            model_id=model_id,
+            duration_seconds=elapsed_seconds(start_ns),
+            cache_hit=False,
         )
 
         # Parse response
-        response_body = json.loads(response["body"].read())
-
-        if model_id.startswith("openai."):
-            # OpenAI models return choices[0].message.content (string or list)
-            first_choice = response_body.get("choices", [{}])[0]
-            message = first_choice.get("message", {})
-            content = message.get("content", "")
-            if isinstance(content, list):
-                # concatenate text entries if provided as a list of content blocks
-                content = "".join(
-                    block.get("text", "") for block in content if isinstance(block, dict)
-                )
-        else:
-            content = response_body.get("content", [{}])[0].get("text", "")
+        response_body = orjson.loads(response["body"].read())
+        content = _extract_content(response_body)
 
         logger.debug("Bedrock response received", content_length=len(content))
 
         # Parse the JSON from the response
         try:
             # Try to extract JSON from the response
-            evaluation = json.loads(content)
+            evaluation = orjson.loads(content)
 
             # Validate the response schema
             is_valid, error_msg = validate_response_schema(evaluation)
-            if not is_valid:
+            if is_valid:
+                # Only well-formed evaluations are cached so a bad response is
+                # retried on the next request instead of being replayed
+                _evaluation_cache[requirement_text] = evaluation
+                if len(_evaluation_cache) > EVALUATION_CACHE_SIZE:
+                    _evaluation_cache.popitem(last=False)
+            else:
                 logger.warning("Schema validation failed", model_id=model_id, error=error_msg)
                 # Continue with the response even if schema validation fails,
                 # but log the issue for monitoring
 
             return evaluation
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logger.error(
                 "Failed to parse Bedrock response",
                 model_id=model_id,
@@ -236,21 +413,19 @@ def call_bedrock(requirement_text: str) -> Dict[str, Any]:
                 "suggestions": ["Please try again"],
             }
     except ClientError as e:
-        duration = time.time() - start_time
         logger.error(
             "Bedrock API error",
             model_id=model_id,
-            duration_seconds=round(duration, 2),
+            duration_seconds=elapsed_seconds(start_ns),
             error_code=e.response.get("Error", {}).get("Code", "Unknown"),
             error_message=str(e),
         )
         raise
     except Exception as e:
-        duration = time.time() - start_time
         logger.error(
             "Unexpected error calling Bedrock",
             model_id=model_id,
-            duration_seconds=round(duration, 2),
+            duration_seconds=elapsed_seconds(start_ns),
             error=str(e),
         )
         raise
@@ -293,7 +468,7 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         or getattr(context, "request_id", None)
         or "unknown"
     )
-    start_time = time.time()
+    start_ns = time.monotonic_ns()
 
     logger.info("Received request", request_id=request_id)
 
@@ -304,25 +479,34 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
 
     # Handle CORS preflight
     if http_method == "OPTIONS":
-        return create_response(200, {"message": "OK"})
+        return OPTIONS_RESPONSE
 
     # Only accept POST requests
     if http_method != "POST":
         logger.warning("Method not allowed", method=http_method, request_id=request_id)
-        return create_response(405, {"error": "Method not allowed"})
+        return METHOD_NOT_ALLOWED_RESPONSE
 
     try:
+        # Check rate limit before any body parsing so a client over its quota
+        # is turned away without paying for the JSON parse and validation
+        client_ip = get_client_ip(event)
+        allowed, rate_error = check_and_increment_quota(client_ip)
+
+        if not allowed:
+            logger.warning("Rate limit exceeded", request_id=request_id, client_ip=client_ip)
+            return create_response(429, {"error": rate_error})
+
         # Parse request body
         body_str = event.get("body", "")
         if not body_str:
             logger.warning("Empty request body", request_id=request_id)
-            return create_response(400, {"error": "Request body is required"})
+            return EMPTY_BODY_RESPONSE
 
         try:
-            body = json.loads(body_str)
-        except json.JSONDecodeError as e:
+            body = orjson.loads(body_str)
+        except orjson.JSONDecodeError as e:
             logger.warning("Invalid JSON in request", request_id=request_id, error=str(e))
-            return create_response(400, {"error": "Invalid JSON in request body"})
+            return INVALID_JSON_RESPONSE
 
         # Validate request
         is_valid, error_msg = validate_request(body)
@@ -330,14 +514,6 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             logger.warning("Request validation failed", request_id=request_id, error=error_msg)
             return create_response(400, {"error": error_msg})
 
-        # Check rate limit
-        client_ip = get_client_ip(event)
-        allowed, rate_error = check_and_increment_quota(client_ip)
-
-        if not allowed:
-            logger.warning("Rate limit exceeded", request_id=request_id, client_ip=client_ip)
-            return create_response(429, {"error": rate_error})
-
         # Call Bedrock for evaluation
         requirement_text = body["requirementText"].strip()
         logger.info(
@@ -349,34 +525,31 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
 
         evaluation = call_bedrock(requirement_text)
 
-        duration = time.time() - start_time
         logger.info(
             "Request completed successfully",
             request_id=request_id,
-            total_duration_seconds=round(duration, 2),
+            total_duration_seconds=elapsed_seconds(start_ns),
         )
         return create_response(200, evaluation)
 
     except ClientError as e:
         error_code = e.response.get("Error", {}).get("Code", "Unknown")
-        duration = time.time() - start_time
         logger.error(
             "AWS service error",
             request_id=request_id,
             error_code=error_code,
             error_message=str(e),
-            duration_seconds=round(duration, 2),
+            duration_seconds=elapsed_seconds(start_ns),
         )
         return create_response(500, {"error": f"AWS service error: {error_code}"})
 
     except Exception as e:
-        duration = time.time() - start_time
         logger.error(
             "Unexpected error",
             request_id=request_id,
             error=str(e),
             error_type=type(e).__name__,
-            duration_seconds=round(duration, 2),
+            duration_seconds=elapsed_seconds(start_ns),
             exc_info=True,
         )
-        return create_response(500, {"error": "Internal server error"})
+        return INTERNAL_ERROR_RESPONSE
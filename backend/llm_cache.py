@@ -0,0 +1,87 @@
+"""
+On-disk cache for Bedrock evaluations.
+
+Entries are content-addressed by the SHA-256 of everything that shapes the
+model's output, so reruns on an unchanged dataset are served from disk instead
+of the network, and changing the model, prompt, or sampling parameters never
+serves a stale evaluation.
+
+The cache is unbounded: nothing is evicted, so delete the cache directory to
+reclaim space.
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+from typing import Any, Dict, Optional
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+# Root directory of the cache; entries live in <first two hex chars>/<hash>.json
+# so no single directory grows unboundedly
+CACHE_PATH = os.environ.get("EVAL_CACHE_PATH", ".bedrock_cache")
+
+
+def cache_key(model_id: str, prompt: str, temperature: float, max_tokens: int) -> str:
+    """Build the cache key for a model invocation."""
+    payload = {
+        "model": model_id,
+        "prompt": prompt,
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+    }
+    return hashlib.sha256(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+
+def _entry_path(key: str) -> str:
+    """Return the file path for a cache key."""
+    return os.path.join(CACHE_PATH, key[:2], f"{key}.json")
+
+
+def get(key: str) -> Optional[Dict[str, Any]]:
+    """
+    Read a cached evaluation.
+
+    Args:
+        key: Cache key from cache_key()
+
+    Returns:
+        The cached evaluation, or None on a miss or an unreadable entry
+    """
+    path = _entry_path(key)
+    try:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    except FileNotFoundError:
+        return None
+    except (OSError, orjson.JSONDecodeError) as e:
+        logger.warning("Ignoring unreadable cache entry %s: %s", path, e)
+        return None
+
+
+def put(key: str, value: Dict[str, Any]) -> None:
+    """
+    Store an evaluation in the cache.
+
+    The entry is written to a temp file and renamed so concurrent readers
+    never see a partially written entry; the temp file is removed if either
+    step fails.
+
+    Args:
+        key: Cache key from cache_key()
+        value: Parsed, schema-valid evaluation
+    """
+    path = _entry_path(key)
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    tmp = tempfile.NamedTemporaryFile("wb", dir=directory, suffix=".tmp", delete=False)
+    try:
+        with tmp:
+            tmp.write(orjson.dumps(value))
+        os.replace(tmp.name, path)
+    except BaseException:
+        os.unlink(tmp.name)
+        raise
@@ -5,11 +5,12 @@ Provides structured JSON logging capabilities for better observability
 in CloudWatch and other log aggregation systems.
 """
 
-import json
 import logging
 import time
 from typing import Any, Dict
 
+import orjson
+
 
 class StructuredLogger:
     """Structured JSON logger for better observability."""
@@ -32,13 +33,18 @@ class StructuredLogger:
             message: Log message
             **kwargs: Additional context fields to include in log
         """
+        levelno = getattr(logging, level)
+        # Skip building and serializing records the logger would discard
+        if not self.logger.isEnabledFor(levelno):
+            return
+
         log_data: Dict[str, Any] = {
             "timestamp": time.time(),
             "level": level,
             "message": message,
             **kwargs,
         }
-        self.logger.log(getattr(logging, level), json.dumps(log_data))
+        self.logger.log(levelno, orjson.dumps(log_data).decode())
 
     def debug(self, message: str, **kwargs: Any) -> None:
         """Log debug message."""
@@ -7,10 +7,13 @@ Stores date + count in DynamoDB and provides quota checking.
 
 import logging
 import os
+import time
+from collections import OrderedDict
 from datetime import datetime, timezone
 from typing import Any, Dict, Tuple
 
 import boto3
+from botocore.config import Config as BotoConfig
 from botocore.exceptions import ClientError
 
 from config import get_config
@@ -30,14 +33,81 @@ TABLE_NAME = config.rate_limit_table or os.environ.get(
 DAILY_LIMIT = config.daily_rate_limit
 AWS_REGION = config.bedrock_region
 
-# Initialize DynamoDB client
-dynamodb = boto3.resource("dynamodb", region_name=AWS_REGION)
-table = dynamodb.Table(TABLE_NAME)
+# Initialize the low-level DynamoDB client once per container; it takes and
+# returns typed attribute values directly, skipping the Table resource's
+# (de)serialization layer. TCP keep-alive keeps the pooled
+# HTTPS connection open between warm invocations, and short timeouts bound how
+# long a slow DynamoDB call can hold up a request before the check fails open.
+dynamodb = boto3.client(
+    "dynamodb",
+    region_name=AWS_REGION,
+    endpoint_url=config.dynamodb_endpoint_url or None,
+    config=BotoConfig(
+        connect_timeout=1,
+        read_timeout=2,
+        tcp_keepalive=True,
+        max_pool_connections=config.dynamodb_max_pool_connections,
+        retries={"mode": "standard", "max_attempts": 3},
+    ),
+)
+
+
+# Counter update expressions; only the date value changes between calls. ADD
+# treats a missing counter as zero.
+_INCREMENT_EXPRESSION = "ADD request_count :inc SET #date = :today"
+_SAME_DAY_CONDITION = "attribute_not_exists(#date) OR #date = :today"
+_EXPRESSION_NAMES = {"#date": "date"}
+_ZERO = {"N": "0"}
+_ONE = {"N": "1"}
+
+# Clients seen over their limit in this container, mapped to the UTC epoch day
+# they hit it. Counts only grow within a day, so their further requests are denied
+# without a DynamoDB round-trip; the map is cleared if it reaches its bound.
+EXHAUSTED_CACHE_SIZE = 10_000
+_exhausted_clients: Dict[str, int] = {}
+
+# Circuit breaker: after BREAKER_THRESHOLD consecutive DynamoDB failures the
+# table is left alone for BREAKER_COOLDOWN seconds and requests are counted in
+# this container's memory instead. The first request after the cool-down
+# probes DynamoDB again (half-open): the failure count is only reset by a
+# successful call, so a failed probe reopens the breaker straight away
+BREAKER_THRESHOLD = 5
+BREAKER_COOLDOWN = 30
+_consecutive_failures = 0
+_breaker_open_until = 0.0
+_fallback_counts: Dict[str, Tuple[int, int]] = {}
+
+# Requests within this many of the limit are logged at INFO
+NEAR_LIMIT_MARGIN = 5
+
+RATE_LIMIT_MESSAGE = (
+    f"Daily rate limit of {DAILY_LIMIT} requests exceeded. Please try again tomorrow."
+)
+
+# Recent usage lookups keyed by client IP, as (time.monotonic() when read,
+# usage), in least- to most-recently-used order; see get_current_usage
+USAGE_CACHE_TTL = 5
+USAGE_CACHE_SIZE = 10_000
+_usage_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+# (UTC day number since the epoch, its YYYY-MM-DD string); the string is only
+# reformatted when the day rolls over
+_today_cache: Tuple[int, str] = (-1, "")
+
+
+def get_epoch_day() -> int:
+    """Get the number of whole UTC days since the Unix epoch."""
+    return int(time.time()) // 86400
 
 
 def get_today_date() -> str:
     """Get today's date in YYYY-MM-DD format (UTC)."""
-    return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    global _today_cache
+    epoch_day = get_epoch_day()
+    if _today_cache[0] != epoch_day:
+        today = datetime.fromtimestamp(epoch_day * 86400, timezone.utc).strftime("%Y-%m-%d")
+        _today_cache = (epoch_day, today)
+    return _today_cache[1]
 
 
 def check_and_increment_quota(client_ip: str) -> Tuple[bool, str]:
@@ -56,35 +126,55 @@ def check_and_increment_quota(client_ip: str) -> Tuple[bool, str]:
         - If allowed is True, error_message is empty
         - If allowed is False, error_message contains the reason
     """
+    global _consecutive_failures
+
     # Skip rate limiting for unknown IPs or if disabled
     if client_ip == "unknown" or os.environ.get("SKIP_RATE_LIMIT") == "true":
         logger.debug("Rate limiting skipped", client_ip=client_ip)
         return True, ""
 
-    today = get_today_date()
+    # Counters are stored against the UTC epoch day as a number, which needs
+    # no date formatting per request
+    today = get_epoch_day()
+
+    exhausted_on = _exhausted_clients.get(client_ip)
+    if exhausted_on == today:
+        logger.debug("Rate limit already exceeded today", client_ip=client_ip)
+        return False, RATE_LIMIT_MESSAGE
+    if exhausted_on is not None:
+        # The client's block expired at midnight UTC
+        del _exhausted_clients[client_ip]
+
+    if time.monotonic() < _breaker_open_until:
+        return _check_quota_in_memory(client_ip, today)
+
     pk = f"IP#{client_ip}"
 
     try:
         # Try to increment the counter atomically
-        response = table.update_item(
-            Key={"pk": pk},
-            UpdateExpression=(
-                "SET request_count = if_not_exists(request_count, :zero) + :inc, " "#date = :today"
-            ),
-            ConditionExpression="attribute_not_exists(#date) OR #date = :today",
-            ExpressionAttributeNames={"#date": "date"},
-            ExpressionAttributeValues={":zero": 0, ":inc": 1, ":today": today},
+        response = dynamodb.update_item(
+            TableName=TABLE_NAME,
+            Key={"pk": {"S": pk}},
+            UpdateExpression=_INCREMENT_EXPRESSION,
+            ConditionExpression=_SAME_DAY_CONDITION,
+            ExpressionAttributeNames=_EXPRESSION_NAMES,
+            ExpressionAttributeValues={":inc": _ONE, ":today": {"N": str(today)}},
             ReturnValues="UPDATED_NEW",
         )
+        _consecutive_failures = 0
 
-        new_count = int(response["Attributes"]["request_count"])
-        logger.info("Rate limit check", client_ip=client_ip, count=new_count, limit=DAILY_LIMIT)
+        new_count = int(response["Attributes"]["request_count"]["N"])
+        # Routine counts are only logged at DEBUG, so the common path builds no
+        # log record; clients close to or over their limit are logged at INFO
+        log = logger.info if new_count > DAILY_LIMIT - NEAR_LIMIT_MARGIN else logger.debug
+        log("Rate limit check", client_ip=client_ip, count=new_count, limit=DAILY_LIMIT)
+        _record_usage(client_ip, new_count)
 
         if new_count > DAILY_LIMIT:
-            return (
-                False,
-                f"Daily rate limit of {DAILY_LIMIT} requests exceeded. Please try again tomorrow.",
-            )
+            if len(_exhausted_clients) >= EXHAUSTED_CACHE_SIZE:
+                _exhausted_clients.clear()
+            _exhausted_clients[client_ip] = today
+            return False, RATE_LIMIT_MESSAGE
 
         return True, ""
 
@@ -93,6 +183,7 @@ def check_and_increment_quota(client_ip: str) -> Tuple[bool, str]:
 
         if error_code == "ConditionalCheckFailedException":
             # Date changed - reset the counter for the new day
+            _consecutive_failures = 0
             logger.info("New day detected, resetting counter", client_ip=client_ip)
             return reset_counter_for_new_day(client_ip, today)
 
@@ -103,21 +194,54 @@ def check_and_increment_quota(client_ip: str) -> Tuple[bool, str]:
             error_code=error_code,
             error=str(e),
         )
+        _record_dynamodb_failure()
         return True, ""
 
     except Exception as e:
         # Log error but allow the request (fail open)
         logger.error("Unexpected error during rate limit check", client_ip=client_ip, error=str(e))
+        _record_dynamodb_failure()
         return True, ""
 
 
-def reset_counter_for_new_day(client_ip: str, today: str) -> Tuple[bool, str]:
+def _record_dynamodb_failure() -> None:
+    """Count a failed DynamoDB call, opening the circuit breaker at the threshold."""
+    global _consecutive_failures, _breaker_open_until
+    _consecutive_failures += 1
+    if _consecutive_failures >= BREAKER_THRESHOLD:
+        _breaker_open_until = time.monotonic() + BREAKER_COOLDOWN
+        logger.warning("DynamoDB circuit breaker opened", cooldown_seconds=BREAKER_COOLDOWN)
+
+
+def _check_quota_in_memory(client_ip: str, today: int) -> Tuple[bool, str]:
+    """
+    Count a request against an in-memory quota while DynamoDB is bypassed.
+
+    Args:
+        client_ip: The IP address of the client making the request
+        today: Today's UTC epoch day
+
+    Returns:
+        Tuple of (allowed: bool, error_message: str)
+    """
+    day, count = _fallback_counts.get(client_ip, (today, 0))
+    count = count + 1 if day == today else 1
+    if client_ip not in _fallback_counts and len(_fallback_counts) >= EXHAUSTED_CACHE_SIZE:
+        _fallback_counts.clear()
+    _fallback_counts[client_ip] = (today, count)
+
+    if count > DAILY_LIMIT:
+        return False, RATE_LIMIT_MESSAGE
+    return True, ""
+
+
+def reset_counter_for_new_day(client_ip: str, today: int) -> Tuple[bool, str]:
     """
     Reset the counter for a new day.
 
     Args:
         client_ip: The IP address of the client
-        today: Today's date string
+        today: Today's UTC epoch day
 
     Returns:
         Tuple of (allowed: bool, error_message: str)
@@ -125,20 +249,57 @@ def reset_counter_for_new_day(client_ip: str, today: str) -> Tuple[bool, str]:
     pk = f"IP#{client_ip}"
 
     try:
-        table.put_item(Item={"pk": pk, "date": today, "request_count": 1})
+        dynamodb.put_item(
+            TableName=TABLE_NAME,
+            Item={"pk": {"S": pk}, "date": {"N": str(today)}, "request_count": _ONE},
+        )
         logger.info("Counter reset", client_ip=client_ip, date=today)
+        _record_usage(client_ip, 1)
         return True, ""
 
     except Exception as e:
         logger.error("Error resetting counter", client_ip=client_ip, error=str(e))
+        _record_dynamodb_failure()
         # Fail open
         return True, ""
 
 
+def _record_usage(client_ip: str, requests_used: int) -> Dict[str, Any]:
+    """
+    Build a client's usage for today and cache it for get_current_usage.
+
+    The quota check already gets the post-increment count back from
+    UpdateItem, so recording it here lets a following usage lookup skip its
+    own GetItem and keeps a cached lookup from going stale.
+
+    Args:
+        client_ip: The IP address of the client
+        requests_used: Requests counted against today's quota
+
+    Returns:
+        Dictionary with usage information
+    """
+    usage = {
+        "ip": client_ip,
+        "date": get_today_date(),
+        "requests_used": requests_used,
+        "requests_remaining": max(0, DAILY_LIMIT - requests_used),
+        "daily_limit": DAILY_LIMIT,
+    }
+    _usage_cache[client_ip] = (time.monotonic(), usage)
+    _usage_cache.move_to_end(client_ip)
+    if len(_usage_cache) > USAGE_CACHE_SIZE:
+        _usage_cache.popitem(last=False)
+    return usage
+
+
 def get_current_usage(client_ip: str) -> Dict[str, Any]:
     """
     Get the current usage statistics for a client IP.
 
+    Lookups are cached for USAGE_CACHE_TTL seconds. If DynamoDB cannot be
+    read, an older lookup from the same day is returned with "stale": True.
+
     Args:
         client_ip: The IP address of the client
 
@@ -148,31 +309,28 @@ def get_current_usage(client_ip: str) -> Dict[str, Any]:
     pk = f"IP#{client_ip}"
     today = get_today_date()
 
+    cached = _usage_cache.get(client_ip)
+    if cached is not None and cached[1]["date"] != today:
+        cached = None
+    if cached is not None and time.monotonic() - cached[0] < USAGE_CACHE_TTL:
+        _usage_cache.move_to_end(client_ip)
+        return cached[1]
+
     try:
-        response = table.get_item(Key={"pk": pk})
+        response = dynamodb.get_item(TableName=TABLE_NAME, Key={"pk": {"S": pk}})
         item = response.get("Item", {})
 
         # Check if the record is for today
-        if item.get("date") == today:
-            return {
-                "ip": client_ip,
-                "date": today,
-                "requests_used": int(item.get("request_count", 0)),
-                "requests_remaining": max(0, DAILY_LIMIT - int(item.get("request_count", 0))),
-                "daily_limit": DAILY_LIMIT,
-            }
+        if item.get("date", {}).get("N") == str(get_epoch_day()):
+            requests_used = int(item.get("request_count", _ZERO)["N"])
         else:
             # Record is from a previous day
-            return {
-                "ip": client_ip,
-                "date": today,
-                "requests_used": 0,
-                "requests_remaining": DAILY_LIMIT,
-                "daily_limit": DAILY_LIMIT,
-            }
+            requests_used = 0
 
     except Exception as e:
         logger.error("Error getting usage", client_ip=client_ip, error=str(e))
+        if cached is not None:
+            return {**cached[1], "stale": True}
         return {
             "ip": client_ip,
             "date": today,
@@ -181,3 +339,5 @@ def get_current_usage(client_ip: str) -> Dict[str, Any]:
             "daily_limit": DAILY_LIMIT,
             "error": "Could not retrieve usage data",
         }
+
+    return _record_usage(client_ip, requests_used)
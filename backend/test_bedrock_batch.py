@@ -0,0 +1,78 @@
+"""
+Unit tests for the bedrock_batch module.
+
+Tests job submission and output collection with mocked S3 and Bedrock clients.
+"""
+
+import unittest
+from unittest.mock import MagicMock, patch
+
+import orjson
+
+import bedrock_batch
+
+
+def _fake_clients(status, output_lines=()):
+    """Build mocked S3 and Bedrock clients for a job ending in the given status."""
+    s3_client = MagicMock()
+    s3_client.get_object.return_value = {"Body": MagicMock(iter_lines=lambda: list(output_lines))}
+    bedrock = MagicMock()
+    bedrock.create_model_invocation_job.return_value = {
+        "jobArn": "arn:aws:bedrock:us-east-1:123456789012:model-invocation-job/abc123"
+    }
+    bedrock.get_model_invocation_job.return_value = {"status": status}
+    return {"s3": s3_client, "bedrock": bedrock}
+
+
+class TestRunJob(unittest.TestCase):
+    """Test cases for running a batch inference job."""
+
+    def test_uploads_inputs_and_reads_outputs(self):
+        """Test that each input becomes a record and outputs are keyed by record ID."""
+        output_lines = [
+            orjson.dumps({"recordId": "a", "modelOutput": {"ok": True}}),
+            b"",
+            orjson.dumps({"recordId": "b", "error": {"errorCode": 400}}),
+        ]
+        clients = _fake_clients("Completed", output_lines)
+
+        with patch("bedrock_batch.boto3.client", side_effect=lambda name, **_: clients[name]):
+            outputs = bedrock_batch.run_job({"a": {"n": 1}, "b": {"n": 2}}, "bucket", "role")
+
+        uploaded = clients["s3"].put_object.call_args.kwargs["Body"].splitlines()
+        self.assertEqual(
+            [orjson.loads(line) for line in uploaded],
+            [{"recordId": "a", "modelInput": {"n": 1}}, {"recordId": "b", "modelInput": {"n": 2}}],
+        )
+        self.assertTrue(
+            clients["s3"].get_object.call_args.kwargs["Key"].endswith("/abc123/input.jsonl.out")
+        )
+        self.assertEqual(outputs["a"]["modelOutput"], {"ok": True})
+        self.assertIn("error", outputs["b"])
+
+    @patch("bedrock_batch.time.sleep")
+    def test_polls_until_terminal_status(self, mock_sleep):
+        """Test that the job is polled while it is still running."""
+        clients = _fake_clients("Completed")
+        clients["bedrock"].get_model_invocation_job.side_effect = [
+            {"status": "Submitted"},
+            {"status": "InProgress"},
+            {"status": "Completed"},
+        ]
+
+        with patch("bedrock_batch.boto3.client", side_effect=lambda name, **_: clients[name]):
+            bedrock_batch.run_job({"a": {}}, "bucket", "role", poll_seconds=5)
+
+        self.assertEqual(mock_sleep.call_count, 2)
+
+    def test_failed_job_raises(self):
+        """Test that a job ending in a failure state raises."""
+        clients = _fake_clients("Failed")
+
+        with patch("bedrock_batch.boto3.client", side_effect=lambda name, **_: clients[name]):
+            with self.assertRaises(RuntimeError):
+                bedrock_batch.run_job({"a": {}}, "bucket", "role")
+
+
+if __name__ == "__main__":
+    unittest.main()
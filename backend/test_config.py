@@ -4,9 +4,30 @@ Unit tests for the config module.
 Tests configuration loading, validation, and schema checking.
 """
 
+import json
+import os
+import tempfile
 import unittest
-
-from config import Config, get_config, validate_response_schema
+from unittest.mock import patch
+
+from config import (
+    Config,
+    ConfigurationError,
+    get_config,
+    parse_evaluation_response,
+    validate_response_schema,
+)
+
+VALID_RESPONSE = {
+    "ambiguity_detected": True,
+    "ambiguity_details": "Some ambiguous terms found",
+    "testable": False,
+    "testability_details": "No measurable criteria",
+    "completeness_score": 5,
+    "completeness_details": "Missing several key elements",
+    "issues": ["Vague terms", "No acceptance criteria"],
+    "suggestions": ["Add specific metrics", "Define test cases"],
+}
 
 
 class TestConfig(unittest.TestCase):
@@ -56,181 +77,154 @@ class TestConfig(unittest.TestCase):
         self.assertEqual(Config.get_log_level(), "INFO")
 
 
+class TestConfigFromEnv(unittest.TestCase):
+    """Test cases for loading configuration from the environment."""
+
+    @patch.dict(
+        os.environ, {"BEDROCK_TIMEOUT": "60", "MODEL_TEMPERATURE": "0.5", "LOG_LEVEL": "debug"}
+    )
+    def test_env_overrides(self):
+        """Test that environment variables are converted to the field types."""
+        config = Config.from_env()
+        self.assertEqual(config.bedrock_timeout, 60)
+        self.assertEqual(config.model_temperature, 0.5)
+        self.assertEqual(config.log_level, "DEBUG")
+
+    @patch.dict(os.environ, {"BEDROCK_TIMEOUT": "fast"})
+    def test_unconvertible_value(self):
+        """Test that a non-numeric value raises ConfigurationError."""
+        with self.assertRaises(ConfigurationError):
+            Config.from_env()
+
+    @patch.dict(os.environ, {"BEDROCK_TIMEOUT": "500"})
+    def test_out_of_range_value(self):
+        """Test that an out-of-range value raises ConfigurationError."""
+        with self.assertRaises(ConfigurationError):
+            Config.from_env()
+
+    @patch.dict(os.environ, {"BEDROCK_LATENCY_MODE": "fastest"})
+    def test_invalid_latency_mode(self):
+        """Test that an unknown latency mode raises ConfigurationError."""
+        with self.assertRaises(ConfigurationError):
+            Config.from_env()
+
+    @patch.dict(os.environ, {"LOG_LEVEL": "VERBOSE"})
+    def test_invalid_log_level(self):
+        """Test that an unknown log level raises ConfigurationError."""
+        with self.assertRaises(ConfigurationError):
+            Config.from_env()
+
+    @patch.dict(os.environ, {"bedrock_timeout": "45"})
+    def test_lower_case_variable(self):
+        """Test that variable names are matched case-insensitively."""
+        self.assertEqual(Config.from_env().bedrock_timeout, 45)
+
+    def _env_file(self, content):
+        """Write a temporary dotenv file and return its path."""
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        path = os.path.join(tmpdir.name, ".env")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+        return path
+
+    @patch.dict(os.environ, {"MODEL_MAX_TOKENS": "2048"})
+    def test_env_file_values(self):
+        """Test that .env values are read and environment variables take precedence."""
+        path = self._env_file(
+            '# local settings\nexport bedrock_region="eu-west-1"\nMODEL_MAX_TOKENS=512\n'
+        )
+        config = Config.from_env(path)
+        self.assertEqual(config.bedrock_region, "eu-west-1")
+        self.assertEqual(config.model_max_tokens, 2048)
+
+    def test_env_file_unknown_key(self):
+        """Test that a misspelled .env setting raises ConfigurationError."""
+        path = self._env_file("BEDROCK_MODEL=anthropic.claude-3-haiku-20240307-v1:0\n")
+        with self.assertRaises(ConfigurationError):
+            Config.from_env(path)
+
+    def test_config_is_frozen(self):
+        """Test that configuration cannot be modified after creation."""
+        with self.assertRaises(AttributeError):
+            get_config().bedrock_timeout = 60
+
+
 class TestValidateResponseSchema(unittest.TestCase):
     """Test cases for response schema validation."""
 
     def test_valid_response(self):
         """Test that a valid response passes validation."""
-        valid_response = {
-            "ambiguity_detected": True,
-            "ambiguity_details": "Some ambiguous terms found",
-            "testable": False,
-            "testability_details": "No measurable criteria",
-            "completeness_score": 5,
-            "completeness_details": "Missing several key elements",
-            "issues": ["Vague terms", "No acceptance criteria"],
-            "suggestions": ["Add specific metrics", "Define test cases"],
-        }
-
-        is_valid, error = validate_response_schema(valid_response)
+        is_valid, error = validate_response_schema(VALID_RESPONSE)
         self.assertTrue(is_valid)
         self.assertIsNone(error)
 
     def test_missing_required_field(self):
         """Test that missing required fields are detected."""
-        invalid_response = {
-            "ambiguity_detected": True,
-            # Missing ambiguity_details
-            "testable": False,
-            "testability_details": "Details",
-            "completeness_score": 5,
-            "completeness_details": "Details",
-            "issues": [],
-            "suggestions": [],
-        }
+        invalid_response = {k: v for k, v in VALID_RESPONSE.items() if k != "ambiguity_details"}
 
         is_valid, error = validate_response_schema(invalid_response)
         self.assertFalse(is_valid)
         self.assertIn("ambiguity_details", error)
 
-    def test_wrong_type_boolean(self):
-        """Test that wrong type for boolean field is coerced by Pydantic."""
-        # Note: Pydantic v2 coerces string "yes" to boolean, so this will pass
-        # We test with a value that cannot be coerced
-        invalid_response = {
-            "ambiguity_detected": [],  # List cannot be coerced to boolean
-            "ambiguity_details": "Details",
-            "testable": False,
-            "testability_details": "Details",
-            "completeness_score": 5,
-            "completeness_details": "Details",
-            "issues": [],
-            "suggestions": [],
-        }
-
-        is_valid, error = validate_response_schema(invalid_response)
-        self.assertFalse(is_valid)
-        self.assertIn("bool", error.lower())
-
-    def test_wrong_type_integer(self):
-        """Test that wrong type for integer field is detected."""
-        # Pydantic will coerce "5" to 5, so we test with non-coercible value
-        invalid_response = {
-            "ambiguity_detected": True,
-            "ambiguity_details": "Details",
-            "testable": False,
-            "testability_details": "Details",
-            "completeness_score": "invalid",  # Cannot be coerced to int
-            "completeness_details": "Details",
-            "issues": [],
-            "suggestions": [],
-        }
-
-        is_valid, error = validate_response_schema(invalid_response)
-        self.assertFalse(is_valid)
-        self.assertIn("int", error.lower())
-
-    def test_wrong_type_array(self):
-        """Test that wrong type for array field is detected."""
-        invalid_response = {
-            "ambiguity_detected": True,
-            "ambiguity_details": "Details",
-            "testable": False,
-            "testability_details": "Details",
-            "completeness_score": 5,
-            "completeness_details": "Details",
-            "issues": "not an array",  # Should be array
-            "suggestions": [],
-        }
-
-        is_valid, error = validate_response_schema(invalid_response)
+    def test_invalid_field_values(self):
+        """Test that wrong types and out-of-range scores are rejected."""
+        # Pydantic v2 coerces e.g. "yes" to a boolean and "5" to an int, so each
+        # case uses a value that cannot be coerced
+        cases = [
+            ("ambiguity_detected", [], "bool"),
+            ("completeness_score", "invalid", "int"),
+            ("issues", "not an array", "array"),
+            ("completeness_score", 15, "10"),
+            ("completeness_score", 0, "1"),
+            ("issues", [123, 456], "string"),
+        ]
+        for field, value, expected in cases:
+            with self.subTest(field=field, value=value):
+                is_valid, error = validate_response_schema({**VALID_RESPONSE, field: value})
+                self.assertFalse(is_valid)
+                # The error should name the expected type or the violated limit
+                self.assertIn(expected, error)
+
+    def test_non_object_response(self):
+        """Test that a JSON value that is not an object is rejected."""
+        is_valid, error = validate_response_schema(["not", "an", "object"])
         self.assertFalse(is_valid)
-        self.assertIn("array", error)
-
-    def test_score_out_of_range_high(self):
-        """Test that completeness score above 10 is rejected."""
-        invalid_response = {
-            "ambiguity_detected": True,
-            "ambiguity_details": "Details",
-            "testable": False,
-            "testability_details": "Details",
-            "completeness_score": 15,  # Out of range
-            "completeness_details": "Details",
-            "issues": [],
-            "suggestions": [],
-        }
-
-        is_valid, error = validate_response_schema(invalid_response)
-        self.assertFalse(is_valid)
-        self.assertIn("10", error)  # Should mention the limit
-
-    def test_score_out_of_range_low(self):
-        """Test that completeness score below 1 is rejected."""
-        invalid_response = {
-            "ambiguity_detected": True,
-            "ambiguity_details": "Details",
-            "testable": False,
-            "testability_details": "Details",
-            "completeness_score": 0,  # Out of range
-            "completeness_details": "Details",
-            "issues": [],
-            "suggestions": [],
-        }
-
-        is_valid, error = validate_response_schema(invalid_response)
-        self.assertFalse(is_valid)
-        self.assertIn("1", error)  # Should mention the limit
-
-    def test_array_items_wrong_type(self):
-        """Test that array items of wrong type are detected."""
-        invalid_response = {
-            "ambiguity_detected": True,
-            "ambiguity_details": "Details",
-            "testable": False,
-            "testability_details": "Details",
-            "completeness_score": 5,
-            "completeness_details": "Details",
-            "issues": [123, 456],  # Should be strings
-            "suggestions": [],
-        }
-
-        is_valid, error = validate_response_schema(invalid_response)
-        self.assertFalse(is_valid)
-        self.assertIn("string", error)
+        self.assertIsNotNone(error)
 
     def test_boundary_score_values(self):
         """Test that boundary score values (1 and 10) are accepted."""
-        # Test score = 1
-        response_1 = {
-            "ambiguity_detected": True,
-            "ambiguity_details": "Details",
-            "testable": False,
-            "testability_details": "Details",
-            "completeness_score": 1,
-            "completeness_details": "Details",
-            "issues": [],
-            "suggestions": [],
-        }
-
-        is_valid, error = validate_response_schema(response_1)
-        self.assertTrue(is_valid)
+        for score in (1, 10):
+            with self.subTest(score=score):
+                is_valid, error = validate_response_schema(
+                    {**VALID_RESPONSE, "completeness_score": score}
+                )
+                self.assertTrue(is_valid)
+                self.assertIsNone(error)
+
+
+class TestParseEvaluationResponse(unittest.TestCase):
+    """Test cases for single-pass JSON parsing and validation."""
+
+    def test_valid_json(self):
+        """Test that valid JSON text is parsed into a dict."""
+        evaluation, error = parse_evaluation_response(json.dumps(VALID_RESPONSE))
+        self.assertEqual(evaluation, VALID_RESPONSE)
         self.assertIsNone(error)
 
-        # Test score = 10
-        response_10 = {
-            "ambiguity_detected": True,
-            "ambiguity_details": "Details",
-            "testable": False,
-            "testability_details": "Details",
-            "completeness_score": 10,
-            "completeness_details": "Details",
-            "issues": [],
-            "suggestions": [],
-        }
-
-        is_valid, error = validate_response_schema(response_10)
-        self.assertTrue(is_valid)
-        self.assertIsNone(error)
+    def test_invalid_json(self):
+        """Test that malformed JSON is reported as an error."""
+        evaluation, error = parse_evaluation_response("not json")
+        self.assertIsNone(evaluation)
+        self.assertIn("json", error.lower())
+
+    def test_schema_mismatch(self):
+        """Test that well-formed JSON violating the schema is rejected."""
+        evaluation, error = parse_evaluation_response(
+            json.dumps({**VALID_RESPONSE, "completeness_score": 15})
+        )
+        self.assertIsNone(evaluation)
+        self.assertIn("completeness_score", error)
 
 
 if __name__ == "__main__":
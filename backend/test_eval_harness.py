@@ -0,0 +1,447 @@
+"""
+Unit tests for the eval_harness module.
+
+Tests sample orchestration with a mocked Bedrock call.
+"""
+
+import io
+import os
+import tempfile
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+import orjson
+from botocore.exceptions import ClientError, ReadTimeoutError
+
+import eval_harness
+
+VALID_EVALUATION = {
+    "ambiguity_detected": True,
+    "ambiguity_details": "'fast' is not defined",
+    "testable": False,
+    "testability_details": "No measurable criteria",
+    "completeness_score": 3,
+    "completeness_details": "Missing response time target",
+    "issues": ["Vague terms"],
+    "suggestions": ["Specify a latency target"],
+}
+
+
+def _fake_bedrock_client(content):
+    """Build a Bedrock client mock returning an OpenAI-style response with the given content."""
+    client = MagicMock()
+    client.invoke_model.return_value = {
+        "body": io.BytesIO(orjson.dumps({"choices": [{"message": {"content": content}}]}))
+    }
+    return client
+
+
+def _fake_evaluate_sample(sample):
+    """Return a successful result after the sample's configured delay."""
+    time.sleep(sample["delay"])
+    return {"requirement": sample["requirement"], "status": "success"}
+
+
+class TestEvaluateSamples(unittest.TestCase):
+    """Test cases for concurrent sample evaluation."""
+
+    @patch("eval_harness.evaluate_sample", side_effect=_fake_evaluate_sample)
+    def test_results_preserve_dataset_order(self, mock_evaluate):
+        """Test that results come back in dataset order regardless of completion order."""
+        samples = [{"requirement": f"Requirement {i}", "delay": (5 - i) * 0.01} for i in range(5)]
+
+        results = eval_harness.evaluate_samples(samples, concurrency=5)
+
+        self.assertEqual([r["requirement"] for r in results], [s["requirement"] for s in samples])
+        self.assertEqual(mock_evaluate.call_count, 5)
+
+    @patch("eval_harness.evaluate_sample", side_effect=_fake_evaluate_sample)
+    def test_on_result_called_per_sample(self, mock_evaluate):
+        """Test that the result callback sees every result."""
+        samples = [{"requirement": f"Requirement {i}", "delay": 0} for i in range(3)]
+        seen = []
+
+        eval_harness.evaluate_samples(samples, concurrency=2, on_result=seen.append)
+
+        self.assertCountEqual([r["requirement"] for r in seen], [s["requirement"] for s in samples])
+
+    @patch.dict(os.environ, {"EVAL_DEDUP": "1"})
+    @patch("eval_harness.call_bedrock", return_value=VALID_EVALUATION)
+    def test_dedup_evaluates_each_requirement_once(self, mock_call):
+        """Test that duplicates share one evaluation but keep their own expected labels."""
+        requirement = "The system shall be fast."
+        samples = [
+            {"requirement": requirement, "expected": {"testable": False}},
+            {"requirement": "The system shall log in.", "expected": {"testable": False}},
+            {"requirement": requirement, "expected": {"testable": True}},
+        ]
+
+        results = eval_harness.evaluate_samples(samples, concurrency=2)
+
+        self.assertEqual(mock_call.call_count, 2)
+        self.assertEqual([r["requirement"] for r in results], [s["requirement"] for s in samples])
+        self.assertTrue(results[0]["comparisons"]["testability"]["match"])
+        self.assertFalse(results[2]["comparisons"]["testability"]["match"])
+
+    @patch("eval_harness.evaluate_sample", side_effect=_fake_evaluate_sample)
+    def test_empty_samples(self, mock_evaluate):
+        """Test that an empty dataset yields no results."""
+        self.assertEqual(eval_harness.evaluate_samples([], concurrency=4), [])
+        mock_evaluate.assert_not_called()
+
+
+class TestEvaluateSample(unittest.TestCase):
+    """Test cases for single-sample evaluation."""
+
+    @patch("eval_harness.call_bedrock")
+    def test_empty_and_oversize_requirements_skipped(self, mock_call):
+        """Test that requirements outside the API length limits never reach Bedrock."""
+        for requirement in ("", "   ", "x" * (eval_harness.config.max_requirement_length + 1)):
+            with self.subTest(length=len(requirement)):
+                result = eval_harness.evaluate_sample({"requirement": requirement})
+                self.assertEqual(result["status"], "skipped")
+
+        mock_call.assert_not_called()
+
+    @patch("eval_harness.call_bedrock")
+    def test_aws_and_decode_errors_recorded(self, mock_call):
+        """Test that Bedrock and response-decoding failures become error results."""
+        for error in (
+            _client_error("AccessDeniedException"),
+            ReadTimeoutError(endpoint_url="https://bedrock"),
+            orjson.JSONDecodeError("bad", "doc", 0),
+        ):
+            with self.subTest(error=type(error).__name__):
+                mock_call.side_effect = error
+                result = eval_harness.evaluate_sample({"requirement": "The system shall log in."})
+                self.assertEqual(result["status"], "error")
+
+    @patch("eval_harness.call_bedrock", side_effect=AttributeError("bug"))
+    def test_programming_errors_propagate(self, mock_call):
+        """Test that unexpected exceptions are not swallowed as sample errors."""
+        with self.assertRaises(AttributeError):
+            eval_harness.evaluate_sample({"requirement": "The system shall log in."})
+
+
+@patch.dict(os.environ, {"EVAL_NO_CACHE": "1"})
+class TestCallBedrock(unittest.TestCase):
+    """Test cases for the harness Bedrock call."""
+
+    def test_parses_valid_evaluation(self):
+        """Test that a valid JSON evaluation is returned as a dict."""
+        client = _fake_bedrock_client(orjson.dumps(VALID_EVALUATION).decode())
+        with patch("eval_harness._get_bedrock_client", return_value=client):
+            evaluation = eval_harness.call_bedrock("The system shall be fast.")
+
+        self.assertEqual(evaluation, VALID_EVALUATION)
+        request = orjson.loads(client.invoke_model.call_args.kwargs["body"])
+        self.assertIn("The system shall be fast.", request["messages"][0]["content"])
+
+    def test_request_body_escapes_prompt(self):
+        """Test that the spliced request body matches a freshly serialized one."""
+        prompt = 'Quote " backslash \\ newline \n "__PROMPT__" unicode é'
+
+        self.assertEqual(
+            orjson.loads(eval_harness.encode_request_body(prompt)),
+            eval_harness.build_request_body(prompt),
+        )
+
+    def test_unparseable_content_returns_none(self):
+        """Test that non-JSON model output yields None."""
+        client = _fake_bedrock_client("I cannot evaluate this.")
+        with patch("eval_harness._get_bedrock_client", return_value=client):
+            self.assertIsNone(eval_harness.call_bedrock("The system shall be fast."))
+
+
+def _client_error(code):
+    """Build a botocore ClientError with the given error code."""
+    return ClientError({"Error": {"Code": code, "Message": code}}, "InvokeModel")
+
+
+@patch("eval_harness.time.sleep")
+class TestInvokeWithRetry(unittest.TestCase):
+    """Test cases for retrying Bedrock invocations."""
+
+    def test_retries_throttling_then_succeeds(self, mock_sleep):
+        """Test that a throttled call is retried after a backoff."""
+        client = MagicMock()
+        client.invoke_model.side_effect = [_client_error("ThrottlingException"), {"body": None}]
+        with patch("eval_harness._get_bedrock_client", return_value=client):
+            self.assertEqual(eval_harness.invoke_with_retry(b"{}"), {"body": None})
+
+        self.assertEqual(client.invoke_model.call_count, 2)
+        mock_sleep.assert_called_once()
+
+    @patch.dict(os.environ, {"BEDROCK_MAX_RETRIES": "1"})
+    def test_gives_up_after_max_retries(self, mock_sleep):
+        """Test that the last retryable error is raised once retries are exhausted."""
+        client = MagicMock()
+        client.invoke_model.side_effect = _client_error("ModelTimeoutException")
+        with patch("eval_harness._get_bedrock_client", return_value=client):
+            with self.assertRaises(ClientError):
+                eval_harness.invoke_with_retry(b"{}")
+
+        self.assertEqual(client.invoke_model.call_count, 2)
+
+    def test_non_retryable_error_raised_immediately(self, mock_sleep):
+        """Test that validation errors are not retried."""
+        client = MagicMock()
+        client.invoke_model.side_effect = _client_error("ValidationException")
+        with patch("eval_harness._get_bedrock_client", return_value=client):
+            with self.assertRaises(ClientError):
+                eval_harness.invoke_with_retry(b"{}")
+
+        client.invoke_model.assert_called_once()
+        mock_sleep.assert_not_called()
+
+
+@patch("eval_harness._bedrock_client", None)
+class TestGetBedrockClient(unittest.TestCase):
+    """Test cases for the shared Bedrock client."""
+
+    def test_client_leaves_retries_to_invoke_with_retry(self):
+        """Test that the Bedrock client makes a single attempt per call."""
+        with patch("eval_harness.boto3.client") as mock_client:
+            eval_harness._get_bedrock_client()
+
+        retries = mock_client.call_args.kwargs["config"].retries
+        self.assertEqual(retries["max_attempts"], 1)
+
+    def test_concurrent_first_calls_create_one_client(self):
+        """Test that workers racing to make the first call share one client."""
+
+        def slow_client(*args, **kwargs):
+            time.sleep(0.05)
+            return MagicMock()
+
+        with patch("eval_harness.boto3.client", side_effect=slow_client) as mock_client:
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                clients = set(
+                    map(id, pool.map(lambda _: eval_harness._get_bedrock_client(), range(8)))
+                )
+
+        mock_client.assert_called_once()
+        self.assertEqual(len(clients), 1)
+
+
+def _batch_record(record_id):
+    """Build a batch output record holding a valid OpenAI-style evaluation."""
+    content = orjson.dumps(VALID_EVALUATION).decode()
+    return {"recordId": record_id, "modelOutput": {"choices": [{"message": {"content": content}}]}}
+
+
+@patch("bedrock_batch.run_job")
+class TestRunBatch(unittest.TestCase):
+    """Test cases for the Bedrock batch inference path."""
+
+    def test_maps_batch_output_back_to_samples(self, mock_run_job):
+        """Test that output records are matched to samples by record ID."""
+        samples = [
+            {"requirement": "The system shall be fast.", "expected": {"testable": False}},
+            {"requirement": "The system shall log in.", "expected": {"testable": True}},
+        ]
+        mock_run_job.return_value = {
+            "00000000000": _batch_record("00000000000"),
+            "00000000001": {"recordId": "00000000001", "error": {"errorCode": 400}},
+        }
+
+        results = eval_harness.run_batch(samples, "bucket", "role", "prefix", 5)
+
+        model_inputs, *job_args = mock_run_job.call_args.args
+        self.assertEqual(list(model_inputs), ["00000000000", "00000000001"])
+        self.assertEqual(job_args, ["bucket", "role", "prefix", 5])
+        self.assertEqual(results[0]["status"], "success")
+        self.assertTrue(results[0]["comparisons"]["testability"]["match"])
+        self.assertEqual(results[1]["status"], "error")
+
+    def test_skipped_samples_not_submitted(self, mock_run_job):
+        """Test that skipped samples are left out of the job and marked skipped."""
+        samples = [{"requirement": ""}, {"requirement": "The system shall log in."}]
+        mock_run_job.return_value = {"00000000001": _batch_record("00000000001")}
+
+        results = eval_harness.run_batch(samples, "bucket", "role")
+
+        self.assertEqual(list(mock_run_job.call_args.args[0]), ["00000000001"])
+        self.assertEqual([r["status"] for r in results], ["skipped", "success"])
+
+    def test_all_skipped_submits_no_job(self, mock_run_job):
+        """Test that a dataset with nothing to evaluate submits no job."""
+        results = eval_harness.run_batch([{"requirement": "x"}], "bucket", "role")
+
+        mock_run_job.assert_not_called()
+        self.assertEqual(results[0]["status"], "skipped")
+
+
+class TestLoadSamples(unittest.TestCase):
+    """Test cases for dataset loading."""
+
+    def setUp(self):
+        """Create a temporary directory for dataset files."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.samples = [{"requirement": "A"}, {"requirement": "B"}]
+
+    def test_json_dataset(self):
+        """Test loading a JSON document with a samples array."""
+        path = os.path.join(self.tmpdir.name, "dataset.json")
+        with open(path, "wb") as f:
+            f.write(orjson.dumps({"description": "test", "samples": self.samples}))
+
+        self.assertEqual(eval_harness.load_samples(path), self.samples)
+
+    def test_jsonl_dataset(self):
+        """Test loading one sample per line, skipping blank lines."""
+        path = os.path.join(self.tmpdir.name, "dataset.jsonl")
+        with open(path, "wb") as f:
+            for sample in self.samples:
+                eval_harness.write_jsonl_record(f, sample)
+            f.write(b"\n")
+
+        self.assertEqual(eval_harness.load_samples(path), self.samples)
+
+    def test_unchanged_file_not_reparsed(self):
+        """Test that a second load of an unchanged file skips parsing, and a change reloads."""
+        path = os.path.join(self.tmpdir.name, "dataset.json")
+        with open(path, "wb") as f:
+            f.write(orjson.dumps({"samples": self.samples}))
+
+        with patch("eval_harness.orjson.loads", wraps=orjson.loads) as mock_loads:
+            eval_harness.load_samples(path)
+            eval_harness.load_samples(path)
+            self.assertEqual(mock_loads.call_count, 1)
+
+            with open(path, "wb") as f:
+                f.write(orjson.dumps({"samples": self.samples[:1]}))
+            self.assertEqual(eval_harness.load_samples(path), self.samples[:1])
+
+
+class TestLoadResults(unittest.TestCase):
+    """Test cases for reading back streamed results."""
+
+    def test_round_trip_through_metrics(self):
+        """Test that streamed results can be re-scored lazily."""
+        results = [{"status": "error"}, _success((True, True), (False, False))]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "results.jsonl")
+            with open(path, "wb") as f:
+                for result in results:
+                    eval_harness.write_jsonl_record(f, result)
+
+            loaded = eval_harness.load_results(path)
+            self.assertNotIsInstance(loaded, list)
+            metrics = eval_harness.compute_metrics(loaded)
+
+        self.assertEqual(metrics, eval_harness.compute_metrics(results))
+        self.assertEqual(metrics["total_samples"], 2)
+
+
+class TestDiskCached(unittest.TestCase):
+    """Test cases for the on-disk Bedrock evaluation cache."""
+
+    def setUp(self):
+        """Point the cache at a fresh temporary directory."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        patcher = patch("llm_cache.CACHE_PATH", self.tmpdir.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_second_call_served_from_cache(self):
+        """Test that a repeated requirement does not call the wrapped function again."""
+        func = MagicMock(return_value={"testable": True})
+        cached = eval_harness.disk_cached(func)
+
+        self.assertEqual(cached("The system shall log in."), {"testable": True})
+        self.assertEqual(cached("The system shall log in."), {"testable": True})
+        func.assert_called_once()
+
+    def test_failed_evaluation_not_cached(self):
+        """Test that None results are retried on the next call."""
+        func = MagicMock(return_value=None)
+        cached = eval_harness.disk_cached(func)
+
+        self.assertIsNone(cached("The system shall log in."))
+        self.assertIsNone(cached("The system shall log in."))
+        self.assertEqual(func.call_count, 2)
+
+    def test_no_cache_env_bypasses_cache(self):
+        """Test that EVAL_NO_CACHE=1 disables the cache."""
+        func = MagicMock(return_value={"testable": True})
+        cached = eval_harness.disk_cached(func)
+
+        with patch.dict(os.environ, {"EVAL_NO_CACHE": "1"}):
+            cached("The system shall log in.")
+            cached("The system shall log in.")
+
+        self.assertEqual(func.call_count, 2)
+        self.assertEqual(os.listdir(self.tmpdir.name), [])
+
+
+def _success(ambiguity, testability, within_threshold=True):
+    """Build a successful result with the given (ai, expected) comparison pairs."""
+    return {
+        "status": "success",
+        "comparisons": {
+            "ambiguity": {"ai": ambiguity[0], "expected": ambiguity[1]},
+            "testability": {"ai": testability[0], "expected": testability[1]},
+            "completeness": {"within_threshold": within_threshold},
+        },
+    }
+
+
+class TestComputeMetrics(unittest.TestCase):
+    """Test cases for metric computation."""
+
+    def test_confusion_matrix_counts(self):
+        """Test that each (ai, expected) pair lands in the right cell."""
+        results = [
+            _success((True, True), (False, False)),
+            _success((False, False), (True, False)),
+            _success((True, False), (False, True)),
+            _success((False, True), (True, True), within_threshold=False),
+        ]
+
+        metrics = eval_harness.compute_metrics(results)
+
+        for category in ("ambiguity", "testability"):
+            self.assertEqual(
+                {k: metrics[category][k] for k in ("tp", "tn", "fp", "fn")},
+                {"tp": 1, "tn": 1, "fp": 1, "fn": 1},
+            )
+            self.assertEqual(metrics[category]["accuracy"], 0.5)
+        self.assertEqual(metrics["completeness"]["within_threshold"], 3)
+        self.assertEqual(metrics["completeness"]["outside_threshold"], 1)
+
+    def test_skipped_counted_separately(self):
+        """Test that skipped samples are neither errors nor successes."""
+        metrics = eval_harness.compute_metrics(
+            [{"status": "skipped"}, _success((True, True), (True, True))]
+        )
+
+        self.assertEqual(metrics["skipped"], 1)
+        self.assertEqual(metrics["errors"], 0)
+        self.assertEqual(metrics["successful_evaluations"], 1)
+
+    def test_errors_and_missing_values(self):
+        """Test that errors are counted separately and None values are ignored."""
+        results = [{"status": "error"}, _success((None, True), (True, None))]
+
+        metrics = eval_harness.compute_metrics(results)
+
+        self.assertEqual(metrics["errors"], 1)
+        self.assertEqual(metrics["successful_evaluations"], 1)
+        self.assertEqual(metrics["ambiguity"], {"tp": 0, "tn": 0, "fp": 0, "fn": 0})
+        self.assertNotIn("accuracy", metrics["testability"])
+
+    def test_integer_labels_not_counted(self):
+        """Test that 1/0 labels are ignored rather than counted as True/False."""
+        metrics = eval_harness.compute_metrics([_success((1, True), (False, 0))])
+
+        self.assertEqual(metrics["ambiguity"], {"tp": 0, "tn": 0, "fp": 0, "fn": 0})
+        self.assertEqual(metrics["testability"], {"tp": 0, "tn": 0, "fp": 0, "fn": 0})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,68 +4,65 @@ Test cases for handler module.
 Tests input validation, error handling, and integration with mocked Bedrock.
 """
 
-import json
 import os
+import time
 import unittest
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
 # Set env vars before importing handler
 os.environ["RATE_LIMIT_TABLE"] = "test-table"
 os.environ["SKIP_RATE_LIMIT"] = "true"
 
+import orjson  # noqa: E402
+from botocore.exceptions import ClientError  # noqa: E402
+
+import handler as handler_module  # noqa: E402
 from handler import (  # noqa: E402
     build_evaluation_prompt,
+    call_bedrock,
     get_client_ip,
     handler,
+    invoke_model,
     validate_request,
 )
+from config import validate_response_schema  # noqa: E402
+
+# Request bodies and caller context shared by the handler tests
+SHORT_BODY = orjson.dumps({"requirementText": "short"}).decode()
+LONG_REQUIREMENT = "x" * 6000
+VALID_BODY = orjson.dumps(
+    {"requirementText": "The system shall respond within 2 seconds."}
+).decode()
+REQUEST_CONTEXT_WITH_IP = {"identity": {"sourceIp": "1.2.3.4"}}
+
+# API Gateway event the handler tests start from; the handler only reads it,
+# so the nested dicts can be shared between events
+_BASE_EVENT = {"httpMethod": "POST", "requestContext": REQUEST_CONTEXT_WITH_IP, "headers": {}}
+
+# Stand-in for the Lambda context; the handler only reads the request ID
+LAMBDA_CONTEXT = SimpleNamespace(aws_request_id="test-request-id", request_id="test-request-id")
 
 
 class TestValidateRequest(unittest.TestCase):
     """Test cases for request validation."""
 
-    def test_empty_body(self):
-        """Test that empty body is rejected."""
-        is_valid, error = validate_request({})
-        self.assertFalse(is_valid)
-        self.assertIn("empty", error.lower())
-
-    def test_missing_requirement_text(self):
-        """Test that missing requirementText is rejected."""
-        is_valid, error = validate_request({"other_field": "value"})
-        self.assertFalse(is_valid)
-        self.assertIn("requirementText", error)
-
-    def test_non_string_requirement_text(self):
-        """Test that non-string requirementText is rejected."""
-        is_valid, error = validate_request({"requirementText": 123})
-        self.assertFalse(is_valid)
-        self.assertIn("string", error)
-
-    def test_empty_requirement_text(self):
-        """Test that empty requirementText is rejected."""
-        is_valid, error = validate_request({"requirementText": ""})
-        self.assertFalse(is_valid)
-        self.assertIn("empty", error.lower())
-
-    def test_whitespace_only_requirement_text(self):
-        """Test that whitespace-only requirementText is rejected."""
-        is_valid, error = validate_request({"requirementText": "   "})
-        self.assertFalse(is_valid)
-        self.assertIn("empty", error.lower())
-
-    def test_too_short_requirement_text(self):
-        """Test that too short requirementText is rejected."""
-        is_valid, error = validate_request({"requirementText": "short"})
-        self.assertFalse(is_valid)
-        self.assertIn("10", error)
-
-    def test_too_long_requirement_text(self):
-        """Test that too long requirementText is rejected."""
-        long_text = "x" * 6000
-        is_valid, error = validate_request({"requirementText": long_text})
-        self.assertFalse(is_valid)
-        self.assertIn("5000", error)
+    def test_invalid_bodies_rejected(self):
+        """Test that each invalid body is rejected with an error naming the problem."""
+        cases = [
+            ("empty body", {}, "empty"),
+            ("missing requirementText", {"other_field": "value"}, "requirementText"),
+            ("non-string requirementText", {"requirementText": 123}, "string"),
+            ("empty requirementText", {"requirementText": ""}, "empty"),
+            ("whitespace-only requirementText", {"requirementText": "   "}, "empty"),
+            ("too short requirementText", {"requirementText": "short"}, "10"),
+            ("too long requirementText", {"requirementText": LONG_REQUIREMENT}, "5000"),
+        ]
+        for name, body, needle in cases:
+            with self.subTest(name):
+                is_valid, error = validate_request(body)
+                self.assertFalse(is_valid)
+                self.assertIn(needle, error)
 
     def test_valid_requirement_text(self):
         """Test that valid requirementText passes validation."""
@@ -79,122 +76,255 @@ class TestValidateRequest(unittest.TestCase):
 class TestBuildEvaluationPrompt(unittest.TestCase):
     """Test cases for prompt building."""
 
-    def test_prompt_includes_requirement(self):
-        """Test that prompt includes the requirement text."""
-        requirement = "The system shall be fast."
-        prompt = build_evaluation_prompt(requirement)
-        self.assertIn(requirement, prompt)
-
-    def test_prompt_includes_json_format(self):
-        """Test that prompt specifies JSON format."""
-        prompt = build_evaluation_prompt("test requirement")
-        self.assertIn("JSON", prompt)
-        self.assertIn("ambiguity_detected", prompt)
-        self.assertIn("testable", prompt)
-        self.assertIn("completeness_score", prompt)
+    REQUIREMENT = "The system shall be fast."
+
+    @classmethod
+    def setUpClass(cls):
+        """Build the prompt once for every test in the class."""
+        cls.prompt = build_evaluation_prompt(cls.REQUIREMENT)
+
+    def test_prompt_contains_tokens(self):
+        """Test that prompt includes the requirement text and specifies JSON format."""
+        for token in (
+            "JSON",
+            "ambiguity_detected",
+            "testable",
+            "completeness_score",
+            self.REQUIREMENT,
+        ):
+            with self.subTest(token=token):
+                self.assertIn(token, self.prompt)
+
+    def test_request_body_escapes_prompt(self):
+        """Test that the spliced request body matches a freshly serialized one."""
+        prompt = 'Quote " backslash \\ newline \n "__PROMPT__" unicode é'
+
+        self.assertEqual(
+            orjson.loads(handler_module.encode_request_body(prompt)),
+            handler_module._build_body(prompt),
+        )
 
 
-class TestGetClientIp(unittest.TestCase):
-    """Test cases for IP extraction."""
+def _validation_error(message):
+    """Build a ValidationException ClientError with the given message."""
+    error = {"Code": "ValidationException", "Message": message}
+    return ClientError({"Error": error}, "InvokeModel")
+
+
+class TestInvokeModel(unittest.TestCase):
+    """Test cases for the Bedrock latency mode."""
+
+    @patch.object(handler_module, "bedrock_client")
+    def test_standard_mode_omits_latency_config(self, mock_client):
+        """Test that standard mode sends no performance configuration."""
+        invoke_model("model", b"{}")
+        self.assertNotIn("performanceConfigLatency", mock_client.invoke_model.call_args.kwargs)
+
+    @patch.object(handler_module, "_latency_optimized_rejected", False)
+    @patch.object(handler_module, "config", MagicMock(bedrock_latency_mode="optimized"))
+    @patch.object(handler_module, "bedrock_client")
+    def test_optimized_mode_falls_back_on_validation_error(self, mock_client):
+        """Test that a model rejecting optimized mode is retried, then sent standard requests."""
+        rejection = _validation_error("The model does not support latency-optimized inference")
+        mock_client.invoke_model.side_effect = [rejection, {"body": None}]
+        self.assertEqual(invoke_model("model", b"{}"), {"body": None})
+
+        first, second = mock_client.invoke_model.call_args_list
+        self.assertEqual(first.kwargs["performanceConfigLatency"], "optimized")
+        self.assertNotIn("performanceConfigLatency", second.kwargs)
+
+        mock_client.invoke_model.side_effect = None
+        invoke_model("model", b"{}")
+        self.assertEqual(mock_client.invoke_model.call_count, 3)
+        self.assertNotIn("performanceConfigLatency", mock_client.invoke_model.call_args.kwargs)
+
+    @patch.object(handler_module, "_latency_optimized_rejected", False)
+    @patch.object(handler_module, "config", MagicMock(bedrock_latency_mode="optimized"))
+    @patch.object(handler_module, "bedrock_client")
+    def test_other_validation_error_raised(self, mock_client):
+        """Test that a validation error unrelated to the latency config is not retried."""
+        mock_client.invoke_model.side_effect = _validation_error("Malformed input request")
+        with self.assertRaises(ClientError):
+            invoke_model("model", b"{}")
+
+        mock_client.invoke_model.assert_called_once()
+        self.assertFalse(handler_module._latency_optimized_rejected)
+
+
+VALID_EVALUATION = {
+    "ambiguity_detected": False,
+    "ambiguity_details": "Clear requirement",
+    "testable": True,
+    "testability_details": "Has measurable criteria",
+    "completeness_score": 8,
+    "completeness_details": "Well defined",
+    "issues": [],
+    "suggestions": [],
+}
+EVALUATION_TEXT = orjson.dumps(VALID_EVALUATION).decode()
+
+
+def _bedrock_response(content):
+    """Build an invoke_model response whose model output is the given text."""
+    body = MagicMock()
+    body.read.return_value = orjson.dumps({"choices": [{"message": {"content": content}}]})
+    return {"body": body}
+
+
+@patch.object(handler_module, "bedrock_client")
+class TestCallBedrockCache(unittest.TestCase):
+    """Test cases for the in-container evaluation cache."""
 
-    def test_api_gateway_v1_format(self):
-        """Test IP extraction from API Gateway v1 format."""
-        event = {"requestContext": {"identity": {"sourceIp": "1.2.3.4"}}}
-        ip = get_client_ip(event)
-        self.assertEqual(ip, "1.2.3.4")
+    def setUp(self):
+        """Start each test with an empty cache."""
+        handler_module._evaluation_cache.clear()
+        self.addCleanup(handler_module._evaluation_cache.clear)
+
+    def test_repeat_requirement_served_from_cache(self, mock_client):
+        """Test that a repeated requirement does not call Bedrock again."""
+        mock_client.invoke_model.return_value = _bedrock_response(EVALUATION_TEXT)
+
+        self.assertEqual(call_bedrock("The system shall log in."), VALID_EVALUATION)
+        self.assertEqual(call_bedrock("The system shall log in."), VALID_EVALUATION)
+        mock_client.invoke_model.assert_called_once()
+
+    def test_parse_failure_not_cached(self, mock_client):
+        """Test that an unparseable response is retried on the next request."""
+        mock_client.invoke_model.side_effect = lambda **_: _bedrock_response("not json")
+
+        call_bedrock("The system shall log in.")
+        call_bedrock("The system shall log in.")
+        self.assertEqual(mock_client.invoke_model.call_count, 2)
+
+    def test_least_recently_used_entry_evicted(self, mock_client):
+        """Test that the cache is bounded."""
+        mock_client.invoke_model.side_effect = lambda **_: _bedrock_response(EVALUATION_TEXT)
+
+        with patch.object(handler_module, "EVALUATION_CACHE_SIZE", 2):
+            for requirement in ("Requirement A", "Requirement B", "Requirement C"):
+                call_bedrock(requirement)
+
+        self.assertEqual(list(handler_module._evaluation_cache), ["Requirement B", "Requirement C"])
+
+
+@patch.object(handler_module, "bedrock_client")
+class TestPlaceholderRequirements(unittest.TestCase):
+    """Test cases for placeholder requirements answered without Bedrock."""
+
+    def test_placeholder_skips_bedrock(self, mock_client):
+        """Test that placeholder text gets the canned, schema-valid evaluation."""
+        for requirement in ("To be determined", "TBD - fill in later", "Lorem ipsum dolor sit"):
+            with self.subTest(requirement=requirement):
+                evaluation = call_bedrock(requirement)
+                self.assertIs(evaluation, handler_module.PLACEHOLDER_EVALUATION)
+                self.assertTrue(validate_response_schema(evaluation)[0])
+        mock_client.invoke_model.assert_not_called()
+
+    def test_requirement_mentioning_placeholder_calls_bedrock(self, mock_client):
+        """Test that only text that is wholly a placeholder is short-circuited."""
+        handler_module._evaluation_cache.clear()
+        self.addCleanup(handler_module._evaluation_cache.clear)
+        mock_client.invoke_model.return_value = _bedrock_response(EVALUATION_TEXT)
+
+        for requirement in (
+            "The report format is TBD but the system shall export CSV.",
+            "Lorem ipsum: the system shall export CSV.",
+        ):
+            with self.subTest(requirement=requirement):
+                mock_client.invoke_model.reset_mock()
+                call_bedrock(requirement)
+                mock_client.invoke_model.assert_called_once()
+
+    def test_adversarial_text_checked_quickly(self, mock_client):
+        """Test that near-placeholder text that fails to match does not backtrack."""
+        for requirement in ("lorem ipsum " * 400 + "\nq", "tbd - n/a, " * 450 + "q"):
+            with self.subTest(requirement=requirement[:20]):
+                start = time.perf_counter()
+                self.assertFalse(handler_module.is_placeholder(requirement))
+                self.assertLess(time.perf_counter() - start, 0.5)
+
+
+def _make_event(body="", method="POST", **overrides):
+    """Build an API Gateway event from the shared base event."""
+    return {**_BASE_EVENT, "httpMethod": method, "body": body, **overrides}
+
+
+def _run_handler(event):
+    """Run the handler on an event and return its status code and parsed body."""
+    response = handler(event, LAMBDA_CONTEXT)
+    return response["statusCode"], orjson.loads(response["body"])
+
+
+# (case name, event, expected client IP) for get_client_ip
+CLIENT_IP_CASES = (
+    ("API Gateway v1 source IP", {"requestContext": REQUEST_CONTEXT_WITH_IP}, "1.2.3.4"),
+    (
+        "X-Forwarded-For header",
+        {"requestContext": {}, "headers": {"X-Forwarded-For": "1.2.3.4, 5.6.7.8"}},
+        "1.2.3.4",
+    ),
+    (
+        "lowercase x-forwarded-for header",
+        {"requestContext": {}, "headers": {"x-forwarded-for": "1.2.3.4"}},
+        "1.2.3.4",
+    ),
+    ("no IP found", {"requestContext": {}, "headers": {}}, "unknown"),
+)
 
-    def test_x_forwarded_for_header(self):
-        """Test IP extraction from X-Forwarded-For header."""
-        event = {"requestContext": {}, "headers": {"X-Forwarded-For": "1.2.3.4, 5.6.7.8"}}
-        ip = get_client_ip(event)
-        self.assertEqual(ip, "1.2.3.4")
 
-    def test_lowercase_x_forwarded_for(self):
-        """Test IP extraction from lowercase header."""
-        event = {"requestContext": {}, "headers": {"x-forwarded-for": "1.2.3.4"}}
-        ip = get_client_ip(event)
-        self.assertEqual(ip, "1.2.3.4")
+class TestGetClientIp(unittest.TestCase):
+    """Test cases for IP extraction."""
 
-    def test_unknown_ip(self):
-        """Test that unknown is returned when no IP found."""
-        event = {"requestContext": {}, "headers": {}}
-        ip = get_client_ip(event)
-        self.assertEqual(ip, "unknown")
+    def test_client_ip_extraction(self):
+        """Test IP extraction from each supported event shape."""
+        for name, event, expected_ip in CLIENT_IP_CASES:
+            with self.subTest(name):
+                self.assertEqual(get_client_ip(event), expected_ip)
 
 
 class TestHandler(unittest.TestCase):
     """Test cases for main Lambda handler."""
 
-    def setUp(self):
-        """Set up test fixtures."""
-        self.mock_context = MagicMock()
-        self.mock_context.aws_request_id = "test-request-id"
-        self.mock_context.request_id = "test-request-id"
-
     def test_options_request(self):
         """Test CORS preflight OPTIONS request."""
-        event = {"httpMethod": "OPTIONS"}
-        response = handler(event, self.mock_context)
-        self.assertEqual(response["statusCode"], 200)
-
-    def test_get_request_not_allowed(self):
-        """Test that GET requests are rejected."""
-        event = {"httpMethod": "GET"}
-        response = handler(event, self.mock_context)
-        self.assertEqual(response["statusCode"], 405)
-        body = json.loads(response["body"])
-        self.assertIn("error", body)
-
-    def test_empty_body(self):
-        """Test that empty body returns 400."""
-        event = {"httpMethod": "POST", "body": ""}
-        response = handler(event, self.mock_context)
-        self.assertEqual(response["statusCode"], 400)
-        body = json.loads(response["body"])
-        self.assertIn("error", body)
-
-    def test_invalid_json_body(self):
-        """Test that invalid JSON returns 400."""
-        event = {"httpMethod": "POST", "body": "not json"}
-        response = handler(event, self.mock_context)
-        self.assertEqual(response["statusCode"], 400)
-        body = json.loads(response["body"])
-        self.assertIn("JSON", body["error"])
-
-    def test_invalid_requirement_text(self):
-        """Test that invalid requirementText returns 400."""
-        event = {"httpMethod": "POST", "body": json.dumps({"requirementText": "short"})}
-        response = handler(event, self.mock_context)
-        self.assertEqual(response["statusCode"], 400)
-        body = json.loads(response["body"])
-        self.assertIn("error", body)
-
-    @patch("handler.call_bedrock")
+        event = _make_event(method="OPTIONS")
+        status, _ = _run_handler(event)
+        self.assertEqual(status, 200)
+
+    def test_rejected_requests(self):
+        """Test that bad methods and bodies get a 4xx response naming the problem."""
+        cases = [
+            ("GET not allowed", _make_event(method="GET"), 405, "Method not allowed"),
+            ("empty body", _make_event(), 400, "required"),
+            ("invalid JSON", _make_event("not json"), 400, "JSON"),
+            ("invalid requirementText", _make_event(SHORT_BODY), 400, "10"),
+        ]
+        for name, event, expected_status, needle in cases:
+            with self.subTest(name):
+                status, body = _run_handler(event)
+                self.assertEqual(status, expected_status)
+                self.assertIn("error", body)
+                self.assertIn(needle, body["error"])
+
+    @patch.object(handler_module, "validate_request")
+    @patch.object(
+        handler_module, "check_and_increment_quota", return_value=(False, "Daily limit exceeded")
+    )
+    def test_rate_limit_checked_before_body(self, mock_quota, mock_validate):
+        """Test that a client over its quota is rejected before the body is parsed."""
+        status, _ = _run_handler(_make_event("not json"))
+        self.assertEqual(status, 429)
+        mock_quota.assert_called_once_with("1.2.3.4")
+        mock_validate.assert_not_called()
+
+    @patch.object(handler_module, "call_bedrock")
     def test_successful_evaluation(self, mock_bedrock):
         """Test successful evaluation flow."""
-        # Mock Bedrock response
-        mock_bedrock.return_value = {
-            "ambiguity_detected": False,
-            "ambiguity_details": "Clear requirement",
-            "testable": True,
-            "testability_details": "Has measurable criteria",
-            "completeness_score": 8,
-            "completeness_details": "Well defined",
-            "issues": [],
-            "suggestions": [],
-        }
-
-        event = {
-            "httpMethod": "POST",
-            "body": json.dumps({"requirementText": "The system shall respond within 2 seconds."}),
-            "requestContext": {"identity": {"sourceIp": "1.2.3.4"}},
-        }
-
-        response = handler(event, self.mock_context)
-        self.assertEqual(response["statusCode"], 200)
-        body = json.loads(response["body"])
-        self.assertIn("ambiguity_detected", body)
-        self.assertIn("completeness_score", body)
+        mock_bedrock.return_value = VALID_EVALUATION
+
+        status, body = _run_handler(_make_event(VALID_BODY))
+        self.assertEqual(status, 200)
+        self.assertEqual(body, VALID_EVALUATION)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,79 @@
+"""
+Unit tests for the llm_cache module.
+
+Tests cache key construction and on-disk storage.
+"""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import llm_cache
+
+
+class TestCacheKey(unittest.TestCase):
+    """Test cases for cache key construction."""
+
+    def test_key_is_stable(self):
+        """Test that identical inputs produce the same key."""
+        self.assertEqual(
+            llm_cache.cache_key("model", "prompt", 0.2, 1024),
+            llm_cache.cache_key("model", "prompt", 0.2, 1024),
+        )
+
+    def test_key_covers_sampling_parameters(self):
+        """Test that every input field changes the key."""
+        base = llm_cache.cache_key("model", "prompt", 0.2, 1024)
+        self.assertNotEqual(base, llm_cache.cache_key("other-model", "prompt", 0.2, 1024))
+        self.assertNotEqual(base, llm_cache.cache_key("model", "other prompt", 0.2, 1024))
+        self.assertNotEqual(base, llm_cache.cache_key("model", "prompt", 0.0, 1024))
+        self.assertNotEqual(base, llm_cache.cache_key("model", "prompt", 0.2, 2048))
+
+
+class TestCacheStorage(unittest.TestCase):
+    """Test cases for reading and writing cache entries."""
+
+    def setUp(self):
+        """Point the cache at a fresh temporary directory."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        patcher = patch("llm_cache.CACHE_PATH", self.tmpdir.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.key = llm_cache.cache_key("model", "prompt", 0.2, 1024)
+
+    def test_miss_returns_none(self):
+        """Test that an unknown key is a miss."""
+        self.assertIsNone(llm_cache.get(self.key))
+
+    def test_round_trip_is_sharded(self):
+        """Test that a stored entry is read back from its shard directory."""
+        llm_cache.put(self.key, {"testable": True})
+
+        self.assertEqual(llm_cache.get(self.key), {"testable": True})
+        self.assertEqual(os.listdir(self.tmpdir.name), [self.key[:2]])
+        self.assertEqual(
+            os.listdir(os.path.join(self.tmpdir.name, self.key[:2])), [f"{self.key}.json"]
+        )
+
+    def test_failed_write_leaves_no_temp_file(self):
+        """Test that the temp file is removed if the entry cannot be renamed into place."""
+        with patch("llm_cache.os.replace", side_effect=OSError("Invalid cross-device link")):
+            with self.assertRaises(OSError):
+                llm_cache.put(self.key, {"testable": True})
+
+        self.assertEqual(os.listdir(os.path.join(self.tmpdir.name, self.key[:2])), [])
+
+    def test_unreadable_entry_is_a_miss(self):
+        """Test that a corrupt entry is ignored rather than raised."""
+        os.makedirs(os.path.join(self.tmpdir.name, self.key[:2]))
+        with open(os.path.join(self.tmpdir.name, self.key[:2], f"{self.key}.json"), "w") as f:
+            f.write("{not json")
+
+        with self.assertLogs("llm_cache", level="WARNING"):
+            self.assertIsNone(llm_cache.get(self.key))
+
+
+if __name__ == "__main__":
+    unittest.main()
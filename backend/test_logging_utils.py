@@ -0,0 +1,43 @@
+"""
+Unit tests for the logging_utils module.
+
+Tests structured JSON log output and level filtering.
+"""
+
+import json
+import logging
+import unittest
+from unittest.mock import patch
+
+from logging_utils import StructuredLogger
+
+
+class TestStructuredLogger(unittest.TestCase):
+    """Test cases for StructuredLogger."""
+
+    def setUp(self):
+        """Create an isolated logger at INFO level."""
+        self.base_logger = logging.getLogger("test_logging_utils")
+        self.base_logger.setLevel(logging.INFO)
+        self.logger = StructuredLogger(self.base_logger)
+
+    def test_emits_json_with_context(self):
+        """Test that a log line is a JSON object including the context fields."""
+        with self.assertLogs(self.base_logger, level="INFO") as captured:
+            self.logger.info("Request completed", request_id="abc", duration_seconds=1.5)
+
+        log_data = json.loads(captured.records[0].getMessage())
+        self.assertEqual(log_data["level"], "INFO")
+        self.assertEqual(log_data["message"], "Request completed")
+        self.assertEqual(log_data["request_id"], "abc")
+        self.assertEqual(log_data["duration_seconds"], 1.5)
+
+    @patch("logging_utils.orjson.dumps")
+    def test_disabled_level_not_serialized(self, mock_dumps):
+        """Test that messages below the logger's level are dropped before serialization."""
+        self.logger.debug("Bedrock response received", content_length=10)
+        mock_dumps.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,277 @@
+"""
+Unit tests for the rate_limit module.
+
+Tests date handling and quota checks.
+"""
+
+import os
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from botocore.exceptions import ClientError
+
+import rate_limit
+
+
+class TestGetTodayDate(unittest.TestCase):
+    """Test cases for the memoized UTC date."""
+
+    def test_matches_current_utc_date(self):
+        """Test that the date is today's date in UTC."""
+        self.assertEqual(
+            rate_limit.get_today_date(), datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        )
+
+    def test_date_rolls_over_at_utc_midnight(self):
+        """Test that a cached date is not returned once the day changes."""
+        midnight = datetime(2024, 3, 2, tzinfo=timezone.utc).timestamp()
+        with patch("rate_limit.time.time", return_value=midnight - 1):
+            self.assertEqual(rate_limit.get_today_date(), "2024-03-01")
+        with patch("rate_limit.time.time", return_value=midnight):
+            self.assertEqual(rate_limit.get_today_date(), "2024-03-02")
+
+
+@patch.dict(os.environ, {"SKIP_RATE_LIMIT": "false"})
+@patch("rate_limit.dynamodb")
+class TestCheckAndIncrementQuota(unittest.TestCase):
+    """Test cases for the daily quota check."""
+
+    def setUp(self):
+        """Start each test with no clients known to be over their limit."""
+        rate_limit._exhausted_clients.clear()
+        self.addCleanup(rate_limit._exhausted_clients.clear)
+        self.addCleanup(rate_limit._usage_cache.clear)
+
+    def _count(self, count):
+        """Build an update_item response with the given request count."""
+        return {"Attributes": {"request_count": {"N": str(count)}}}
+
+    def test_under_limit_allowed(self, mock_dynamodb):
+        """Test that a client under its limit is allowed."""
+        mock_dynamodb.update_item.return_value = self._count(1)
+        self.assertEqual(rate_limit.check_and_increment_quota("1.2.3.4"), (True, ""))
+
+        request = mock_dynamodb.update_item.call_args.kwargs
+        self.assertEqual(request["UpdateExpression"], "ADD request_count :inc SET #date = :today")
+        self.assertEqual(set(request["ExpressionAttributeValues"]), {":inc", ":today"})
+
+    def test_exhausted_client_denied_without_dynamodb(self, mock_dynamodb):
+        """Test that a client over its limit is denied locally for the rest of the day."""
+        mock_dynamodb.update_item.return_value = self._count(rate_limit.DAILY_LIMIT + 1)
+
+        for _ in range(3):
+            allowed, message = rate_limit.check_and_increment_quota("1.2.3.4")
+            self.assertFalse(allowed)
+            self.assertEqual(message, rate_limit.RATE_LIMIT_MESSAGE)
+        mock_dynamodb.update_item.assert_called_once()
+
+    def test_counter_from_string_date_is_reset(self, mock_dynamodb):
+        """Test that a counter stored under a YYYY-MM-DD date is restarted as epoch days."""
+        mock_dynamodb.update_item.side_effect = ClientError(
+            {"Error": {"Code": "ConditionalCheckFailedException"}}, "UpdateItem"
+        )
+
+        self.assertEqual(rate_limit.check_and_increment_quota("1.2.3.4"), (True, ""))
+        item = mock_dynamodb.put_item.call_args.kwargs["Item"]
+        self.assertEqual(item["date"], {"N": str(rate_limit.get_epoch_day())})
+
+    def test_exhausted_client_rechecked_next_day(self, mock_dynamodb):
+        """Test that the local denial expires when the date changes."""
+        mock_dynamodb.update_item.return_value = self._count(rate_limit.DAILY_LIMIT + 1)
+        with patch("rate_limit.get_epoch_day", return_value=19783):
+            rate_limit.check_and_increment_quota("1.2.3.4")
+
+        mock_dynamodb.update_item.return_value = self._count(1)
+        with patch("rate_limit.get_epoch_day", return_value=19784):
+            self.assertEqual(rate_limit.check_and_increment_quota("1.2.3.4"), (True, ""))
+        self.assertEqual(mock_dynamodb.update_item.call_count, 2)
+        self.assertNotIn("1.2.3.4", rate_limit._exhausted_clients)
+
+
+@patch("rate_limit.dynamodb")
+class TestGetCurrentUsage(unittest.TestCase):
+    """Test cases for cached usage lookups."""
+
+    def setUp(self):
+        """Start each test with an empty usage cache."""
+        rate_limit._usage_cache.clear()
+        self.addCleanup(rate_limit._usage_cache.clear)
+
+    def _item(self, count):
+        """Build a get_item response for today with the given request count."""
+        return {
+            "Item": {
+                "pk": {"S": "IP#1.2.3.4"},
+                "date": {"N": str(rate_limit.get_epoch_day())},
+                "request_count": {"N": str(count)},
+            }
+        }
+
+    def test_repeat_lookup_served_from_cache(self, mock_dynamodb):
+        """Test that a lookup within the TTL does not read DynamoDB again."""
+        mock_dynamodb.get_item.return_value = self._item(3)
+
+        self.assertEqual(rate_limit.get_current_usage("1.2.3.4")["requests_used"], 3)
+        self.assertEqual(rate_limit.get_current_usage("1.2.3.4")["requests_used"], 3)
+        mock_dynamodb.get_item.assert_called_once()
+
+    def test_expired_lookup_served_stale_on_error(self, mock_dynamodb):
+        """Test that an expired lookup is returned, marked stale, if DynamoDB fails."""
+        mock_dynamodb.get_item.return_value = self._item(3)
+        rate_limit.get_current_usage("1.2.3.4")
+
+        mock_dynamodb.get_item.side_effect = Exception("DynamoDB unavailable")
+        with patch("rate_limit.USAGE_CACHE_TTL", 0):
+            usage = rate_limit.get_current_usage("1.2.3.4")
+
+        self.assertTrue(usage["stale"])
+        self.assertEqual(usage["requests_used"], 3)
+
+    @patch.dict(os.environ, {"SKIP_RATE_LIMIT": "false"})
+    def test_quota_check_primes_usage(self, mock_dynamodb):
+        """Test that usage right after a quota check needs no GetItem."""
+        mock_dynamodb.update_item.return_value = {"Attributes": {"request_count": {"N": "4"}}}
+        rate_limit.check_and_increment_quota("1.2.3.4")
+
+        usage = rate_limit.get_current_usage("1.2.3.4")
+        self.assertEqual(usage["requests_used"], 4)
+        self.assertEqual(usage["requests_remaining"], rate_limit.DAILY_LIMIT - 4)
+        mock_dynamodb.get_item.assert_not_called()
+
+    @patch.dict(os.environ, {"SKIP_RATE_LIMIT": "false"})
+    def test_quota_check_refreshes_cached_lookup(self, mock_dynamodb):
+        """Test that a cached lookup is not served stale once the counter moves."""
+        mock_dynamodb.get_item.return_value = self._item(3)
+        rate_limit.get_current_usage("1.2.3.4")
+
+        mock_dynamodb.update_item.return_value = {"Attributes": {"request_count": {"N": "4"}}}
+        rate_limit.check_and_increment_quota("1.2.3.4")
+
+        self.assertEqual(rate_limit.get_current_usage("1.2.3.4")["requests_used"], 4)
+        mock_dynamodb.get_item.assert_called_once()
+
+    @patch.dict(os.environ, {"SKIP_RATE_LIMIT": "false"})
+    def test_new_day_reset_refreshes_cached_lookup(self, mock_dynamodb):
+        """Test that a cached lookup shows the reset count after a new-day reset."""
+        mock_dynamodb.get_item.return_value = self._item(3)
+        rate_limit.get_current_usage("1.2.3.4")
+
+        mock_dynamodb.update_item.side_effect = ClientError(
+            {"Error": {"Code": "ConditionalCheckFailedException"}}, "UpdateItem"
+        )
+        rate_limit.check_and_increment_quota("1.2.3.4")
+
+        self.assertEqual(rate_limit.get_current_usage("1.2.3.4")["requests_used"], 1)
+        mock_dynamodb.get_item.assert_called_once()
+
+    @patch.dict(os.environ, {"SKIP_RATE_LIMIT": "false"})
+    def test_new_day_reset_primes_usage(self, mock_dynamodb):
+        """Test that the new-day reset records a count of one."""
+        mock_dynamodb.update_item.side_effect = ClientError(
+            {"Error": {"Code": "ConditionalCheckFailedException"}}, "UpdateItem"
+        )
+        rate_limit.check_and_increment_quota("1.2.3.4")
+
+        self.assertEqual(rate_limit.get_current_usage("1.2.3.4")["requests_used"], 1)
+        mock_dynamodb.get_item.assert_not_called()
+
+    def test_least_recently_used_lookup_evicted(self, mock_dynamodb):
+        """Test that the usage cache is bounded."""
+        mock_dynamodb.get_item.return_value = self._item(3)
+
+        with patch("rate_limit.USAGE_CACHE_SIZE", 2):
+            for client_ip in ("1.1.1.1", "2.2.2.2", "1.1.1.1", "3.3.3.3"):
+                rate_limit.get_current_usage(client_ip)
+
+        self.assertEqual(list(rate_limit._usage_cache), ["1.1.1.1", "3.3.3.3"])
+
+    def test_error_without_cached_lookup(self, mock_dynamodb):
+        """Test that a failed lookup with nothing cached reports the error."""
+        mock_dynamodb.get_item.side_effect = Exception("DynamoDB unavailable")
+        self.assertIn("error", rate_limit.get_current_usage("1.2.3.4"))
+
+
+@patch.dict(os.environ, {"SKIP_RATE_LIMIT": "false"})
+@patch("rate_limit.dynamodb")
+class TestCircuitBreaker(unittest.TestCase):
+    """Test cases for the DynamoDB circuit breaker."""
+
+    def setUp(self):
+        """Start each test with a closed breaker and no in-memory counts."""
+        self._reset()
+        self.addCleanup(self._reset)
+
+    def _reset(self):
+        """Close the breaker and clear in-memory state."""
+        rate_limit._consecutive_failures = 0
+        rate_limit._breaker_open_until = 0.0
+        rate_limit._fallback_counts.clear()
+        rate_limit._exhausted_clients.clear()
+        rate_limit._usage_cache.clear()
+
+    def _fail(self, mock_dynamodb):
+        """Make every update_item call fail."""
+        mock_dynamodb.update_item.side_effect = ClientError(
+            {"Error": {"Code": "InternalServerError"}}, "UpdateItem"
+        )
+
+    def test_breaker_opens_after_consecutive_failures(self, mock_dynamodb):
+        """Test that DynamoDB is bypassed once the failure threshold is reached."""
+        self._fail(mock_dynamodb)
+
+        for _ in range(rate_limit.BREAKER_THRESHOLD + 3):
+            self.assertEqual(rate_limit.check_and_increment_quota("1.2.3.4"), (True, ""))
+        self.assertEqual(mock_dynamodb.update_item.call_count, rate_limit.BREAKER_THRESHOLD)
+
+    def test_open_breaker_enforces_limit_in_memory(self, mock_dynamodb):
+        """Test that an open breaker still denies clients over their limit."""
+        rate_limit._breaker_open_until = float("inf")
+
+        for _ in range(rate_limit.DAILY_LIMIT):
+            self.assertTrue(rate_limit.check_and_increment_quota("1.2.3.4")[0])
+        self.assertFalse(rate_limit.check_and_increment_quota("1.2.3.4")[0])
+        mock_dynamodb.update_item.assert_not_called()
+
+    def test_breaker_retries_dynamodb_after_cooldown(self, mock_dynamodb):
+        """Test that DynamoDB is called again once the cool-down has passed."""
+        self._fail(mock_dynamodb)
+        with patch("rate_limit.BREAKER_COOLDOWN", 0):
+            for _ in range(rate_limit.BREAKER_THRESHOLD + 1):
+                rate_limit.check_and_increment_quota("1.2.3.4")
+
+        self.assertEqual(mock_dynamodb.update_item.call_count, rate_limit.BREAKER_THRESHOLD + 1)
+
+    def test_failed_probe_reopens_breaker(self, mock_dynamodb):
+        """Test that one failure after the cool-down reopens the breaker."""
+        self._fail(mock_dynamodb)
+        for _ in range(rate_limit.BREAKER_THRESHOLD):
+            rate_limit.check_and_increment_quota("1.2.3.4")
+
+        # Let the cool-down expire; the next request probes DynamoDB and fails
+        rate_limit._breaker_open_until = 0.0
+        for _ in range(3):
+            rate_limit.check_and_increment_quota("1.2.3.4")
+        self.assertEqual(mock_dynamodb.update_item.call_count, rate_limit.BREAKER_THRESHOLD + 1)
+
+    def test_successful_probe_closes_breaker(self, mock_dynamodb):
+        """Test that a successful call resets the failure count."""
+        rate_limit._consecutive_failures = rate_limit.BREAKER_THRESHOLD
+        mock_dynamodb.update_item.return_value = {"Attributes": {"request_count": {"N": "1"}}}
+
+        rate_limit.check_and_increment_quota("1.2.3.4")
+        self.assertEqual(rate_limit._consecutive_failures, 0)
+
+    def test_failed_counter_reset_counts_as_failure(self, mock_dynamodb):
+        """Test that a failed new-day put_item counts towards opening the breaker."""
+        mock_dynamodb.update_item.side_effect = ClientError(
+            {"Error": {"Code": "ConditionalCheckFailedException"}}, "UpdateItem"
+        )
+        mock_dynamodb.put_item.side_effect = Exception("DynamoDB unavailable")
+
+        self.assertEqual(rate_limit.check_and_increment_quota("1.2.3.4"), (True, ""))
+        self.assertEqual(rate_limit._consecutive_failures, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -139,11 +139,24 @@ resource "aws_iam_role_policy" "lambda_bedrock" {
 # -----------------------------------------------------------------------------
 
 # Package the Lambda code
+# Only runtime modules are shipped: the eval harness, its cache and the unit
+# tests are never imported by the handler and would only enlarge the bundle
+# that each cold start downloads and unpacks.
 data "archive_file" "lambda_zip" {
   type        = "zip"
   source_dir  = "${path.module}/../backend"
   output_path = "${path.module}/lambda.zip"
-  excludes    = ["__pycache__", "*.pyc", "eval_harness.py", "eval_dataset.json"]
+  excludes = [
+    "__pycache__",
+    "*.pyc",
+    "eval_harness.py",
+    "llm_cache.py",
+    "bedrock_batch.py",
+    "eval_dataset.json",
+    ".bedrock_cache",
+    "test_*.py",
+    "requirements.txt",
+  ]
 }
 
 resource "aws_lambda_function" "evaluator" {
@@ -163,6 +176,7 @@ resource "aws_lambda_function" "evaluator" {
       BEDROCK_REGION          = var.aws_region
       BEDROCK_MODEL_ID        = var.bedrock_model_id
       BEDROCK_TIMEOUT         = var.bedrock_timeout
+      BEDROCK_LATENCY_MODE    = var.bedrock_latency_mode
       LOG_LEVEL               = var.log_level
       MODEL_TEMPERATURE       = var.model_temperature
       MODEL_MAX_TOKENS        = var.model_max_tokens
@@ -101,6 +101,7 @@ output "deployment_summary" {
     daily_rate_limit      = var.daily_rate_limit
     lambda_timeout        = var.lambda_timeout
     bedrock_timeout       = var.bedrock_timeout
+    bedrock_latency_mode  = var.bedrock_latency_mode
     log_level             = var.log_level
     model_temperature     = var.model_temperature
     model_max_tokens      = var.model_max_tokens
@@ -95,6 +95,17 @@ variable "bedrock_timeout" {
   }
 }
 
+variable "bedrock_latency_mode" {
+  description = "Bedrock inference latency mode (standard or optimized; optimized requires model support)"
+  type        = string
+  default     = "standard"
+  
+  validation {
+    condition     = contains(["standard", "optimized"], var.bedrock_latency_mode)
+    error_message = "bedrock_latency_mode must be one of: standard, optimized"
+  }
+}
+
 variable "model_temperature" {
   description = "Model temperature for consistent evaluations (0.0-1.0)"
   type        = number